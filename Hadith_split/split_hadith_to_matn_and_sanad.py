@@ -5,7 +5,9 @@ This script processes Arabic hadiths from a CSV file and splits each hadith into
 - sanad: The chain of narrators
 - matn: The prophetic statement
 
-Output is saved as JSON with structure:
+Results are appended to a JSONL checkpoint (one object per line) after
+every batch; run with --export to write the sorted JSON array.
+Each record has the structure:
 {
     "hadith_index": int,
     "hadith_text": str,
@@ -14,14 +16,27 @@ Output is saved as JSON with structure:
 }
 """
 
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import time
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from tqdm import tqdm
 from pydantic import BaseModel, Field
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, FewShotChatMessagePromptTemplate
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
+from openai import APIConnectionError, APITimeoutError, OpenAI, RateLimitError
 from dotenv import load_dotenv
 
 
@@ -35,11 +50,25 @@ INPUT_CSV_OPTIONS = [
     "../data/Sahih Bukhari Without_Tashkel.csv",
     "../extract_data_v2/Bukhari/Bukhari_Without_Tashkel.csv"
 ]
-OUTPUT_JSON = "bukhari_hadiths_split.json"
+OUTPUT_JSONL = "bukhari_hadiths_split.jsonl"  # Append-only checkpoint
+OUTPUT_JSON = "bukhari_hadiths_split.json"  # Sorted final export
 BATCH_SIZE = 20
+MAX_CONCURRENCY = 32  # Max LLM requests in flight per batch
+HADITHS_PER_PROMPT = 5  # Hadiths packed into a single LLM request
+MAX_IN_FLIGHT_BATCHES = 4  # Batches processed concurrently
+HTTP_MAX_CONNECTIONS = 128  # Size of the shared keep-alive connection pool
+MAX_RETRIES = 5  # Attempts per request on rate limits / transient network errors
 MODEL = "gpt-5-mini"
 TEMPERATURE = 0
 
+# On-disk response cache; bump PROMPT_VERSION whenever the prompt changes
+CACHE_DIR = Path(".hadith_cache")
+PROMPT_VERSION = "v4"
+
+# Offline OpenAI Batch API mode (--batch-api)
+BATCH_REQUESTS_JSONL = "batch_requests.jsonl"
+BATCH_POLL_SECONDS = 60
+
 
 # =============================================================================
 # Pydantic Model
@@ -51,6 +80,10 @@ class HadithParts(BaseModel):
     matn: str
 
 
+class HadithPartsBatch(BaseModel):
+    items: List[HadithParts]
+
+
 # =============================================================================
 # Few-Shot Examples
 # =============================================================================
@@ -93,49 +126,75 @@ examples = [
 # Helper Functions
 # =============================================================================
 
-def escape_json_for_prompt(d: dict) -> str:
-    """
-    Converts a dictionary into escaped JSON block suitable for LangChain prompt.
-    Turns { → {{ and } → }}
-    """
-    import json
-    raw = json.dumps(d, ensure_ascii=False, indent=2)
-    escaped = raw.replace("{", "{{").replace("}", "}}")
-    return escaped
+def cache_key(text: str) -> str:
+    """Content hash of a hadith under the current model/prompt"""
+    return hashlib.sha256(f"{MODEL}|{PROMPT_VERSION}|{text}".encode("utf-8")).hexdigest()
 
 
-def build_few_shots(examples: List[dict]) -> str:
-    """Build few-shot examples block for the prompt"""
-    text = ""
-    for ex in examples:
-        escaped_out = escape_json_for_prompt({
-            "sanad": ex["sanad"],
-            "upper_narrator": ex["upper_narrator"],
-            "matn": ex["matn"]
-        })
+def cache_path(text: str) -> Path:
+    """Content-addressed cache file for a hadith under the current model/prompt"""
+    key = cache_key(text)
+    return CACHE_DIR / key[:2] / f"{key}.json"
 
-        text += f"""
-Example Input:
-{ex['hadith']}
 
-Example Output:
-{escaped_out}
+def load_cached(text: str) -> Optional[HadithParts]:
+    """Return the cached HadithParts for a text, or None on a miss"""
+    path = cache_path(text)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return HadithParts(**orjson.loads(f.read()))
+    except (OSError, ValueError):
+        return None
 
-"""
-    return text
+
+def store_cached(text: str, parts: HadithParts):
+    """Atomically write a response to the cache (tempfile + os.replace)"""
+    path = cache_path(text)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(parts.model_dump()))
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 # =============================================================================
 # LLM Chain Setup
 # =============================================================================
 
-few_shots_text = build_few_shots(examples)
-
-llm = ChatOpenAI(model=MODEL, temperature=TEMPERATURE)
-structured_llm = llm.with_structured_output(HadithParts)
-
-prompt = ChatPromptTemplate.from_messages([
-    ("system", f"""
+# One pooled HTTP/2 client shared by every request so keep-alive sockets are
+# reused across batches instead of paying a TLS handshake per call
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_CONNECTIONS
+    ),
+    timeout=httpx.Timeout(60.0)
+)
+
+# Native JSON mode: the schema lives in the system prompt and responses are
+# parsed with a single orjson call instead of a function-calling round-trip
+llm = ChatOpenAI(
+    model=MODEL,
+    temperature=TEMPERATURE,
+    http_async_client=http_client,
+    model_kwargs={"response_format": {"type": "json_object"}}
+)
+
+# The system prompt and few-shot messages are built once and kept
+# byte-identical across runs so the provider's automatic prompt-prefix cache
+# can reuse them; everything that varies per request lives in the final
+# human message. SystemMessage is passed as-is, so its JSON needs no escaping.
+FORMAT_INSTRUCTIONS = json.dumps(HadithParts.model_json_schema(), ensure_ascii=False, indent=2)
+
+SYSTEM_PROMPT = f"""
 You are an expert in Hadith sciences. Extract the following:
 
 1. sanad — full narrator chain before the Prophet ﷺ speaks.
@@ -147,26 +206,136 @@ Guidelines:
 - Keep sanad and matn exactly as written.
 - Upper narrator = last narrator before the Prophet ﷺ quote.
 
-Here are examples to follow:
+Return ONLY JSON in this schema:
+{FORMAT_INSTRUCTIONS}
+"""
+
+BATCH_INSTRUCTIONS = """
+When you receive several numbered hadiths, return a JSON object
+{"items": [...]} with exactly one entry per hadith, in the same order as
+the input.
+"""
 
-{few_shots_text}
+few_shot_prompt = FewShotChatMessagePromptTemplate(
+    examples=[
+        {
+            "hadith": ex["hadith"],
+            "output_json": json.dumps({
+                "sanad": ex["sanad"],
+                "upper_narrator": ex["upper_narrator"],
+                "matn": ex["matn"]
+            }, ensure_ascii=False, indent=2)
+        }
+        for ex in examples
+    ],
+    example_prompt=ChatPromptTemplate.from_messages([
+        ("human", "Hadith:\n{hadith}"),
+        ("ai", "{output_json}")
+    ])
+)
 
-Return ONLY JSON in this schema:
-{{format_instructions}}
-"""),
+prompt = ChatPromptTemplate.from_messages([
+    SystemMessage(content=SYSTEM_PROMPT),
+    few_shot_prompt,
     ("human", "Hadith:\n{text}")
 ])
 
-chain = prompt | structured_llm
+# Several numbered hadiths per request so the system prompt is sent once per group
+batch_prompt = ChatPromptTemplate.from_messages([
+    SystemMessage(content=SYSTEM_PROMPT + BATCH_INSTRUCTIONS),
+    few_shot_prompt,
+    ("human", "Hadiths ({count}):\n{texts}")
+])
+
+# Transient API errors are retried per request with exponential backoff and
+# jitter, so one 429 does not take down the rest of the batch
+RETRY_KWARGS = dict(
+    retry_if_exception_type=(RateLimitError, APIConnectionError, APITimeoutError),
+    wait_exponential_jitter=True,
+    stop_after_attempt=MAX_RETRIES
+)
+
+
+def parse_parts(message: AIMessage) -> HadithParts:
+    """Parse a JSON-mode response into HadithParts"""
+    return HadithParts.model_validate(orjson.loads(message.content))
+
+
+def parse_parts_batch(message: AIMessage) -> HadithPartsBatch:
+    """Parse a JSON-mode response into HadithPartsBatch"""
+    return HadithPartsBatch.model_validate(orjson.loads(message.content))
+
+
+chain = (prompt | llm | RunnableLambda(parse_parts)).with_retry(**RETRY_KWARGS)
+batch_chain = (batch_prompt | llm | RunnableLambda(parse_parts_batch)).with_retry(**RETRY_KWARGS)
+
+
+# =============================================================================
+# Regex Fast Path
+# =============================================================================
+
+# Regular hadiths of the form "حدثنا ... عن <upper> [رضي الله عنه] قال: قال/سمعت
+# رسول الله ﷺ ...: "<matn>"" are split locally; everything else goes to the LLM.
+PROPHET_PATTERN = r'(?:رسول\s+الله|النبي)\s*(?:ﷺ|صلى\s+الله\s+عليه\s+وسلم)'
+FAST_PATTERN = re.compile(
+    r'^(?P<sanad>(?:حدثنا|أخبرنا)[^"“”«».]*?\sعن\s+'
+    r'(?P<upper>(?:(?!\sعن\s)[^،,:."“”«»])+?))'
+    r'(?:\s+(?:رضى|رضي)\s+الله\s+عنه(?:ما|م|ا)?)?\s*،?\s*(?:قال\s*:?\s*)?'
+    rf'(?:سمعت\s+{PROPHET_PATTERN}\s*،?\s*يقول|أن\s+{PROPHET_PATTERN}\s*،?\s*قال'
+    rf'|قال\s+{PROPHET_PATTERN}|عن\s+{PROPHET_PATTERN}\s*،?\s*قال)'
+    r'[\s:\u200f]*["“«](?P<quote>[^"“”«»]+)["”»][\s.\u200f]*$',
+    re.DOTALL
+)
+OPEN_QUOTES = str.maketrans('', '', '"“«')
+
+
+def _clean(text: str) -> str:
+    """Drop RTL marks and collapse whitespace"""
+    return " ".join(text.replace("\u200f", "").split())
+
+
+def fast_split(text: str) -> Optional[HadithParts]:
+    """
+    Split a regular single-chain hadith without calling the LLM.
+
+    Args:
+        text: Hadith text in Arabic
+
+    Returns:
+        HadithParts if the text matches FAST_PATTERN, otherwise None
+    """
+    m = FAST_PATTERN.match(text)
+    if m is None:
+        return None
+    prefix = text[m.start('upper'):m.start('quote')].translate(OPEN_QUOTES)
+    return HadithParts(
+        sanad=_clean(m.group('sanad')),
+        upper_narrator=_clean(m.group('upper')),
+        matn=_clean(f"عن {prefix}{m.group('quote')}")
+    )
 
 
 # =============================================================================
 # Core Processing Functions
 # =============================================================================
 
-def split_hadith_batch(texts: List[str]) -> List[HadithParts]:
+def format_numbered(texts: List[str]) -> str:
+    """Render hadiths as a numbered list for a packed prompt"""
+    return "\n".join(f"{n}) {text}" for n, text in enumerate(texts, start=1))
+
+
+async def split_hadith_batch(texts: List[str]) -> List[HadithParts]:
     """
-    Process a batch of hadith texts with fallback to sequential processing.
+    Process a batch of hadith texts concurrently.
+
+    Texts already answered for the current MODEL/PROMPT_VERSION are served
+    from CACHE_DIR, and regular hadiths matched by FAST_PATTERN are split
+    locally. The rest are packed HADITHS_PER_PROMPT to a request and run on
+    the event loop via ``abatch`` with at most MAX_CONCURRENCY calls in
+    flight. Rate limits and transient network errors are retried with backoff
+    inside each chain; groups whose answer still fails or has the wrong
+    length are retried one hadith per request. Failures are isolated per
+    hadith and replaced by an ERROR placeholder (never cached).
 
     Args:
         texts: List of hadith texts in Arabic
@@ -174,53 +343,120 @@ def split_hadith_batch(texts: List[str]) -> List[HadithParts]:
     Returns:
         List of HadithParts objects containing sanad, upper_narrator, and matn
     """
-    batch_inputs = [{"text": h} for h in texts]
+    results: List[Optional[HadithParts]] = [load_cached(h) or fast_split(h) for h in texts]
+    misses = [i for i, res in enumerate(results) if res is None]
+    if not misses:
+        return results
 
-    try:
-        # Try processing the whole batch at once
-        return chain.batch(batch_inputs)
-    except Exception as e:
-        print(f"Batch failed ({str(e)}). Switching to sequential processing...")
-        results = []
-        for item in batch_inputs:
-            try:
-                # Process one by one
-                res = chain.invoke(item)
-                results.append(res)
-            except Exception as inner_e:
-                print(f"Skipping hadith due to error: {inner_e}")
-                # Append error placeholder
-                results.append(HadithParts(
-                    sanad="ERROR",
-                    upper_narrator="ERROR",
-                    matn="ERROR"
-                ))
+    groups = [
+        misses[k:k + HADITHS_PER_PROMPT]
+        for k in range(0, len(misses), HADITHS_PER_PROMPT)
+    ]
+    group_inputs = [
+        {"count": len(group), "texts": format_numbered([texts[i] for i in group])}
+        for group in groups
+    ]
+
+    responses = await batch_chain.abatch(
+        group_inputs,
+        config={"max_concurrency": MAX_CONCURRENCY},
+        return_exceptions=True
+    )
+
+    retry = []
+    for group, res in zip(groups, responses):
+        if isinstance(res, Exception) or len(res.items) != len(group):
+            retry.extend(group)
+            continue
+        for i, parts in zip(group, res.items):
+            store_cached(texts[i], parts)
+            results[i] = parts
+
+    if not retry:
         return results
 
+    # Fall back to one request per hadith for groups that did not line up
+    responses = await chain.abatch(
+        [{"text": texts[i]} for i in retry],
+        config={"max_concurrency": MAX_CONCURRENCY},
+        return_exceptions=True
+    )
+
+    for i, res in zip(retry, responses):
+        if isinstance(res, Exception):
+            print(f"Skipping hadith due to error: {res}")
+            # Append error placeholder
+            results[i] = HadithParts(
+                sanad="ERROR",
+                upper_narrator="ERROR",
+                matn="ERROR"
+            )
+        else:
+            store_cached(texts[i], res)
+            results[i] = res
+    return results
+
+
+def append_results(records: List[Dict], output_file: Path):
+    """Append records to the JSONL checkpoint, one JSON object per line, and fsync"""
+    with open(output_file, 'ab') as f:
+        for rec in records:
+            f.write(orjson.dumps(rec) + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def jsonl_to_sorted_json(jsonl_file: Path, json_file: Path) -> int:
+    """
+    Export the JSONL checkpoint as a JSON array sorted by hadith_index.
+
+    Args:
+        jsonl_file: Path to the append-only JSONL results
+        json_file: Path to the JSON file to write
+
+    Returns:
+        Number of exported records
+    """
+    with open(jsonl_file, 'rb') as f:
+        results = [orjson.loads(line) for line in f if line.strip()]
+    results.sort(key=lambda x: x['hadith_index'])  # Sort by index
+
+    with open(json_file, 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    return len(results)
+
+
+def load_processed_indices(output_file: Path) -> np.ndarray:
+    """Stream hadith_index values from the JSONL checkpoint into a compact int array"""
+    if not output_file.exists():
+        return np.empty(0, dtype=np.int64)
+    with open(output_file, 'rb') as f:
+        return np.fromiter(
+            (orjson.loads(line)['hadith_index'] for line in f if line.strip()),
+            dtype=np.int64
+        )
 
-def process_all_hadiths(df: pd.DataFrame, batch_size: int, output_file: Path):
+
+async def process_all_hadiths(df: pd.DataFrame, batch_size: int, output_file: Path):
     """
     Main processing loop with resume support.
 
     Args:
         df: DataFrame containing hadiths with columns: id/hadith_id and text_ar
         batch_size: Number of hadiths to process in each batch
-        output_file: Path to output JSON file
+        output_file: Path to the append-only JSONL output file
     """
-    # Load existing results if any
-    existing_results = []
-    processed_indices = set()
+    # Collect already processed indices from the checkpoint
+    processed_indices = load_processed_indices(output_file)
 
     if output_file.exists():
         print(f"Found existing output file: {output_file}")
-        with open(output_file, 'r', encoding='utf-8') as f:
-            existing_results = json.load(f)
-        processed_indices = {r['hadith_index'] for r in existing_results}
-        print(f"✓ Loaded {len(existing_results)} previously processed hadiths")
+        print(f"✓ Found {len(processed_indices)} previously processed hadiths")
 
     # Determine which hadiths need processing
     id_col = 'id' if 'id' in df.columns else 'hadith_id'
-    df_to_process = df[~df[id_col].isin(processed_indices)]
+    mask = ~np.isin(df[id_col].to_numpy(), processed_indices)
+    df_to_process = df.loc[mask]
 
     if len(df_to_process) == 0:
         print("✅ All hadiths already processed!")
@@ -228,38 +464,158 @@ def process_all_hadiths(df: pd.DataFrame, batch_size: int, output_file: Path):
 
     print(f"Processing {len(df_to_process)} remaining hadiths...")
 
-    # Process in batches
-    new_results = []
+    # Each unique text is sent once and its answer fanned out to every id that
+    # shares it; batches are plain list slices rather than pandas indexing
+    text_to_ids: Dict[str, List[int]] = {}
+    for idx, text in zip(df_to_process[id_col].tolist(), df_to_process['text_ar'].tolist()):
+        text_to_ids.setdefault(text, []).append(idx)
+    del df_to_process
+    todo = list(text_to_ids)
+    if len(todo) < mask.sum():
+        print(f"   ({mask.sum() - len(todo)} duplicate texts will reuse a single request)")
+
+    # Batch start offsets are handed out to workers through a queue; finished
+    # batches flow to a single writer that appends them to the JSONL, so
+    # checkpoint writes overlap with LLM calls.
+    batch_queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(todo), batch_size):
+        batch_queue.put_nowait(i)
+    num_batches = batch_queue.qsize()
+    result_queue: asyncio.Queue = asyncio.Queue()
+
+    new_count = 0
+
+    async def worker():
+        while True:
+            try:
+                i = batch_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            batch_texts = todo[i:i+batch_size]
+
+            # Extract sanad/matn
+            batch_parts = await split_hadith_batch(batch_texts)
+            await result_queue.put((batch_texts, batch_parts))
+
+    async def writer():
+        nonlocal new_count
+        with tqdm(total=num_batches, desc="Processing batches") as pbar:
+            for _ in range(num_batches):
+                batch_texts, batch_parts = await result_queue.get()
+
+                # Convert to output format
+                records = []
+                for text, parts in zip(batch_texts, batch_parts):
+                    for idx in text_to_ids[text]:
+                        if parts.sanad != "ERROR":  # Skip errors
+                            records.append({
+                                "hadith_index": int(idx),
+                                "hadith_text": text,
+                                "sanad": parts.sanad,
+                                "matn": parts.matn
+                            })
+                        else:
+                            print(f"⚠️  Skipping hadith_index {idx} due to extraction error")
+
+                # Checkpoint every batch, written off the event loop
+                await asyncio.to_thread(append_results, records, output_file)
+                new_count += len(records)
+                pbar.update(1)
+
+    num_workers = min(MAX_IN_FLIGHT_BATCHES, num_batches)
+    await asyncio.gather(writer(), *(worker() for _ in range(num_workers)))
+
+    print(f"✅ Appended {new_count} newly processed hadiths to {output_file}")
+
+
+async def run_pipeline(df: pd.DataFrame, batch_size: int, output_file: Path):
+    """Run process_all_hadiths and close the shared HTTP client afterwards"""
+    try:
+        await process_all_hadiths(df, batch_size, output_file)
+    finally:
+        await http_client.aclose()
+
+
+# =============================================================================
+# OpenAI Batch API
+# =============================================================================
 
-    for i in tqdm(range(0, len(df_to_process), batch_size), desc="Processing batches"):
-        batch_df = df_to_process.iloc[i:i+batch_size]
-        batch_texts = batch_df['text_ar'].tolist()
-        batch_indices = batch_df[id_col].tolist()
+def to_openai_messages(messages: List) -> List[Dict]:
+    """Convert LangChain messages to Chat Completions message dicts"""
+    roles = {"system": "system", "human": "user", "ai": "assistant"}
+    return [{"role": roles[m.type], "content": m.content} for m in messages]
 
-        # Extract sanad/matn
-        batch_parts = split_hadith_batch(batch_texts)
 
-        # Convert to output format
-        for idx, text, parts in zip(batch_indices, batch_texts, batch_parts):
-            if parts.sanad != "ERROR":  # Skip errors
-                new_results.append({
-                    "hadith_index": int(idx),
-                    "hadith_text": text,
-                    "sanad": parts.sanad,
-                    "matn": parts.matn
-                })
-            else:
-                print(f"⚠️  Skipping hadith_index {idx} due to extraction error")
+def run_batch_api(texts: List[str], requests_file: Path) -> int:
+    """
+    Answer hadiths through the OpenAI Batch API and store the results in the cache.
 
-    # Combine and save
-    all_results = existing_results + new_results
-    all_results.sort(key=lambda x: x['hadith_index'])  # Sort by index
+    Each request's custom_id is the hadith's cache key, so the downloaded
+    answers slot straight into CACHE_DIR and the regular pipeline then
+    serves them as cache hits.
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, ensure_ascii=False, indent=2)
+    Args:
+        texts: Hadith texts to submit (should already exclude cache hits)
+        requests_file: Path where the batch request JSONL is written
 
-    print(f"✅ Saved {len(all_results)} hadiths to {output_file}")
-    print(f"   ({len(new_results)} newly processed)")
+    Returns:
+        Number of responses stored in the cache
+    """
+    by_key = {cache_key(text): text for text in texts}
+    if not by_key:
+        return 0
+
+    with open(requests_file, 'wb') as f:
+        for key, text in by_key.items():
+            f.write(orjson.dumps({
+                "custom_id": key,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": MODEL,
+                    "temperature": TEMPERATURE,
+                    "response_format": {"type": "json_object"},
+                    "messages": to_openai_messages(prompt.format_messages(text=text))
+                }
+            }) + b"\n")
+
+    client = OpenAI()
+    with open(requests_file, 'rb') as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(by_key)} requests")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        print(f"  Batch {batch.id}: {batch.status} ({counts.completed}/{counts.total} done)")
+
+    if batch.output_file_id is None:
+        print(f"⚠️  Batch {batch.id} ended with status '{batch.status}' and no output")
+        return 0
+
+    stored = 0
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        row = orjson.loads(line)
+        response = row.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            parts = HadithParts.model_validate(orjson.loads(content))
+        except (KeyError, IndexError, ValueError) as e:
+            print(f"Skipping batch response {row['custom_id']}: {e}")
+            continue
+        store_cached(by_key[row["custom_id"]], parts)
+        stored += 1
+
+    print(f"✓ Cached {stored}/{len(by_key)} batch responses")
+    return stored
 
 
 # =============================================================================
@@ -268,6 +624,18 @@ def process_all_hadiths(df: pd.DataFrame, batch_size: int, output_file: Path):
 
 def main():
     """Main entry point for the script"""
+    parser = argparse.ArgumentParser(description="Split hadiths into sanad and matn")
+    parser.add_argument("--export", action="store_true",
+                        help=f"Export {OUTPUT_JSONL} to a sorted {OUTPUT_JSON} and exit")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Answer pending hadiths via the OpenAI Batch API (up to 24h) before the regular run")
+    args = parser.parse_args()
+
+    if args.export:
+        count = jsonl_to_sorted_json(Path(OUTPUT_JSONL), Path(OUTPUT_JSON))
+        print(f"✅ Exported {count} hadiths to {OUTPUT_JSON}")
+        return
+
     load_dotenv()
 
     # Try to find CSV file from multiple options
@@ -285,21 +653,26 @@ def main():
             print(f"   - {Path(csv_option).absolute()}")
         return
 
-    # Load CSV
+    # Peek at the first row to detect a headless CSV before the full read
+    first_cell = pd.read_csv(csv_path, nrows=1, header=None).iat[0, 0]
+    headless = 'Bukhari' in str(first_cell)
+
+    # Load CSV with Arrow's multithreaded reader and Arrow-backed columns
     print(f"Loading data from: {csv_path}")
-    df = pd.read_csv(csv_path)
+    read_kwargs = dict(engine='pyarrow', dtype_backend='pyarrow')
+    if headless:
+        df = pd.read_csv(csv_path, header=None, names=['text_ar'], **read_kwargs)
+    else:
+        df = pd.read_csv(csv_path, **read_kwargs)
     print(f"✓ Loaded {len(df)} rows")
 
     # Check and adapt column structure
     # Handle different CSV formats
-    if df.columns[0] and 'Bukhari' in str(df.columns[0]):
+    if headless:
         # Headless CSV - first row is actual data
         print("Detected headless CSV format")
-        df.columns = ['hadith_text']
         # Add index as hadith_id
         df.insert(0, 'id', range(1, len(df) + 1))
-        # Rename hadith_text to text_ar
-        df.rename(columns={'hadith_text': 'text_ar'}, inplace=True)
     elif 'hadith_text' in df.columns and 'text_ar' not in df.columns:
         # Has hadith_text column but not text_ar
         df.rename(columns={'hadith_text': 'text_ar'}, inplace=True)
@@ -318,16 +691,26 @@ def main():
     print(f"✓ Using columns: {', '.join(df.columns)}")
 
     # Process
-    output_path = Path(OUTPUT_JSON)
+    output_path = Path(OUTPUT_JSONL)
     print(f"Output will be saved to: {output_path.absolute()}")
-    print(f"Model: {MODEL}, Batch size: {BATCH_SIZE}")
+    print(f"Model: {MODEL}, Batch size: {BATCH_SIZE}, Max concurrency: {MAX_CONCURRENCY}")
     print("-" * 60)
 
-    process_all_hadiths(
+    if args.batch_api:
+        id_col = 'id' if 'id' in df.columns else 'hadith_id'
+        processed_indices = load_processed_indices(output_path)
+        pending = df.loc[~np.isin(df[id_col].to_numpy(), processed_indices), 'text_ar'].tolist()
+        texts = [t for t in dict.fromkeys(pending) if load_cached(t) is None and fast_split(t) is None]
+        print(f"Submitting {len(texts)} hadiths to the OpenAI Batch API...")
+        run_batch_api(texts, Path(BATCH_REQUESTS_JSONL))
+
+    # Cached answers (including Batch API results) are written by the regular
+    # pipeline; anything the batch did not answer falls back to online calls
+    asyncio.run(run_pipeline(
         df=df,
         batch_size=BATCH_SIZE,
         output_file=output_path
-    )
+    ))
 
     print("-" * 60)
     print("✅ Processing complete!")
@@ -27,6 +27,26 @@ def create_test_csv():
     print(f"✓ Created test CSV: {test_file} with {len(test_hadiths)} hadiths")
     return test_file
 
+def test_fast_split_examples():
+    """The regex fast path must agree with the few-shot examples it accepts"""
+    from split_hadith_to_matn_and_sanad import examples, fast_split
+
+    matched = 0
+    for ex in examples:
+        parts = fast_split(ex['hadith'])
+        if parts is None:
+            continue
+        matched += 1
+        assert parts.sanad == ex['sanad']
+        assert parts.upper_narrator == ex['upper_narrator']
+        assert parts.matn.startswith(f"عن {ex['upper_narrator']}")
+    assert matched >= 3
+
+    # Multi-chain and non-direct hadiths are left to the LLM
+    for text in test_hadiths:
+        assert fast_split(text) is None
+
+
 def run_test():
     """Run the splitting script on test data"""
     print("=" * 60)
@@ -41,33 +41,80 @@ app.add_middleware(
 
 neo4j_client = Neo4jClient()
 
+HADITH_TEXT_INDEX = "hadith_text_ft"
+# Arabic light stemming, so "صلاة" also matches "الصلاة" / "والصلاة"
+HADITH_TEXT_ANALYZER = "arabic"
+
 
 @app.on_event("startup")
-def startup() -> None:
+async def startup() -> None:
     neo4j_client.connect()
+    await neo4j_client.connect_async()
+    with neo4j_client.session() as session:
+        existing = session.run(
+            """
+            SHOW FULLTEXT INDEXES YIELD name, options
+            WHERE name = $name
+            RETURN options.indexConfig['fulltext.analyzer'] AS analyzer
+            """,
+            name=HADITH_TEXT_INDEX,
+        ).single()
+        if existing is not None and existing["analyzer"] != HADITH_TEXT_ANALYZER:
+            # Built by an earlier startup with the default (whitespace) analyzer
+            session.run(f"DROP INDEX {HADITH_TEXT_INDEX}")
+        session.run(f"""
+            CREATE FULLTEXT INDEX {HADITH_TEXT_INDEX} IF NOT EXISTS
+            FOR (h:Hadith) ON EACH [h.text]
+            OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{HADITH_TEXT_ANALYZER}'}}}}
+        """)
 
 
 @app.on_event("shutdown")
-def shutdown() -> None:
+async def shutdown() -> None:
     neo4j_client.close()
+    await neo4j_client.close_async()
+
+
+def _fulltext_phrase(query: str) -> str:
+    """Quote a user query as a Lucene phrase so special characters are literal.
+
+    The index matches whole (stemmed) words in sequence, not arbitrary
+    substrings: "صلاة" finds "الصلاة", but a word fragment finds nothing.
+    """
+    return '"' + query.replace("\\", "\\\\").replace('"', '\\"') + '"'
 
 
 @app.get("/api/hadith")
 def search_hadith(query: str = "", source: str = "all") -> List[Dict[str, Any]]:
-    cypher = """
-        MATCH (h:Hadith)
-        WHERE ($source = 'all' OR h.source = $source)
-          AND ($query = '' OR coalesce(h.text, '') CONTAINS $query)
-        OPTIONAL MATCH (h)-[:HAS_CHAIN]->(c:Chain)
-        RETURN h.hadith_index AS hadith_index,
-               h.source AS source,
-               substring(coalesce(h.text, ''), 0, 200) AS hadith_text,
-               count(DISTINCT c) AS chain_count
-        ORDER BY h.hadith_index
-    """
+    if query:
+        # Inverted-index lookup instead of a CONTAINS scan over every Hadith
+        cypher = f"""
+            CALL db.index.fulltext.queryNodes('{HADITH_TEXT_INDEX}', $phrase) YIELD node AS h
+            WITH h
+            WHERE ($source = 'all' OR h.source = $source)
+            OPTIONAL MATCH (h)-[:HAS_CHAIN]->(c:Chain)
+            RETURN h.hadith_index AS hadith_index,
+                   h.source AS source,
+                   substring(coalesce(h.text, ''), 0, 200) AS hadith_text,
+                   count(DISTINCT c) AS chain_count
+            ORDER BY h.hadith_index
+        """
+        params = {"source": source, "phrase": _fulltext_phrase(query)}
+    else:
+        cypher = """
+            MATCH (h:Hadith)
+            WHERE ($source = 'all' OR h.source = $source)
+            OPTIONAL MATCH (h)-[:HAS_CHAIN]->(c:Chain)
+            RETURN h.hadith_index AS hadith_index,
+                   h.source AS source,
+                   substring(coalesce(h.text, ''), 0, 200) AS hadith_text,
+                   count(DISTINCT c) AS chain_count
+            ORDER BY h.hadith_index
+        """
+        params = {"source": source}
 
     with neo4j_client.session() as session:
-        result = session.run(cypher, source=source, query=query)
+        result = session.run(cypher, **params)
         return [
             {
                 "hadith_index": record["hadith_index"],
@@ -80,63 +127,39 @@ def search_hadith(query: str = "", source: str = "all") -> List[Dict[str, Any]]:
 
 
 @app.get("/api/hadith/{source}/{hadith_index}")
-def get_hadith_detail(source: str, hadith_index: int) -> Dict[str, Any]:
-    hadith_cypher = """
+async def get_hadith_detail(source: str, hadith_index: int) -> Dict[str, Any]:
+    # One round-trip: the hadith plus its chains, each with narrators ordered by position
+    cypher = """
         MATCH (h:Hadith {source: $source, hadith_index: $hadith_index})
+        OPTIONAL MATCH (h)-[:HAS_CHAIN]->(c:Chain)-[p:POSITION]->(n:Narrator)
+        WITH h, c, p, n
+        ORDER BY c.chain_id, p.pos
+        WITH h, c, collect(CASE WHEN n IS NULL THEN null ELSE {
+                 name: n.name,
+                 full_name: coalesce(n.full_name, n.name),
+                 position: p.pos
+             } END) AS narrators
+        ORDER BY c.chain_id
+        WITH h, collect(CASE WHEN c IS NULL THEN null ELSE {
+                 chain_id: c.chain_id,
+                 narrators: narrators
+             } END) AS chains
         RETURN h.hadith_index AS hadith_index,
                h.source AS source,
-               h.text AS hadith_text
-    """
-
-    chains_cypher = """
-        MATCH (h:Hadith {source: $source, hadith_index: $hadith_index})-[:HAS_CHAIN]->(c:Chain)
-        MATCH (c)-[p:POSITION]->(n:Narrator)
-        RETURN c.chain_id AS chain_id,
-               p.pos AS pos,
-               n.name AS name,
-               coalesce(n.full_name, n.name) AS full_name
-        ORDER BY c.chain_id, p.pos
+               h.text AS hadith_text,
+               chains
     """
 
-    with neo4j_client.session() as session:
-        hadith_record = session.run(
-            hadith_cypher,
-            source=source,
-            hadith_index=hadith_index,
-        ).single()
+    async with neo4j_client.async_session() as session:
+        result = await session.run(cypher, source=source, hadith_index=hadith_index)
+        record = await result.single()
 
-        if not hadith_record:
-            raise HTTPException(status_code=404, detail="Hadith not found")
-
-        chain_rows = session.run(
-            chains_cypher,
-            source=source,
-            hadith_index=hadith_index,
-        )
-
-        chains_map: Dict[int, List[Dict[str, Any]]] = {}
-        for row in chain_rows:
-            chain_id = row["chain_id"]
-            narrator = {
-                "name": row["name"],
-                "full_name": row["full_name"],
-                "position": row["pos"],
-            }
-            if chain_id not in chains_map:
-                chains_map[chain_id] = []
-            chains_map[chain_id].append(narrator)
-
-        chains = [
-            {
-                "chain_id": chain_id,
-                "narrators": narrators,
-            }
-            for chain_id, narrators in sorted(chains_map.items())
-        ]
+    if not record:
+        raise HTTPException(status_code=404, detail="Hadith not found")
 
-        return {
-            "hadith_index": hadith_record["hadith_index"],
-            "source": hadith_record["source"],
-            "hadith_text": hadith_record["hadith_text"] or "",
-            "chains": chains,
-        }
+    return {
+        "hadith_index": record["hadith_index"],
+        "source": record["source"],
+        "hadith_text": record["hadith_text"] or "",
+        "chains": record["chains"],
+    }
@@ -6,9 +6,18 @@ chains in a format optimized for manual review and validation.
 """
 
 import csv
-import json
-from typing import List, Dict, Any
-from parsing import extract_chains_from_result
+from itertools import islice
+from typing import Any, Dict, Iterable, List
+
+import json_utils
+from parsing import extract_chains_from_results
+
+# Hadiths are processed and flushed with writerows in chunks of this size
+ROWS_PER_FLUSH = 1024
+WRITE_BUFFER_SIZE = 1 << 20
+
+# The "no chain" cell is the same for every hadith, so it is serialized once
+NO_CHAIN_JSON = json_utils.dumps({"error": "No chain extracted"})
 
 
 def format_chain(chain: List[str]) -> str:
@@ -33,11 +42,10 @@ def export_validation_csv(
         Number of hadiths processed
     """
     # Load data
-    with open(input_path, "r", encoding="utf-8") as f:
-        hadiths: List[Dict[str, Any]] = json.load(f)
+    hadiths: Iterable[Dict[str, Any]] = json_utils.iter_items(input_path)
 
     # Prepare CSV
-    with open(output_path, "w", encoding="utf-8", newline="") as f:
+    with open(output_path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE) as f:
         fieldnames = [
             "hadith_index",
             "hadith_text",
@@ -46,40 +54,37 @@ def export_validation_csv(
             "validation_status",
             "notes"
         ]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
 
         hadith_count = 0
-        for hadith in hadiths:
-            hadith_index = hadith.get("hadith_index", "")
-            hadith_text = hadith.get("hadith_text", "")
-
-            # Extract chains
-            chains = extract_chains_from_result(hadith)
-            n_chains = len(chains)
-
-            # Format chains as JSON object
-            if chains:
-                chains_dict = {
-                    f"chain_{i+1}": format_chain(chain)
-                    for i, chain in enumerate(chains)
-                }
-                all_chains_json = json.dumps(chains_dict, ensure_ascii=False)
-            else:
-                all_chains_json = json.dumps({"error": "No chain extracted"}, ensure_ascii=False)
-
-            # Prepare row data
-            row = {
-                "hadith_index": hadith_index,
-                "hadith_text": hadith_text,
-                "n_chains": n_chains,
-                "all_chains_combined": all_chains_json,
-                "validation_status": "",
-                "notes": ""
-            }
-
-            writer.writerow(row)
-            hadith_count += 1
+        dumps = json_utils.dumps
+        records = iter(hadiths)
+        # Extract chains a chunk at a time; the input may be a stream
+        for batch in iter(lambda: list(islice(records, ROWS_PER_FLUSH)), []):
+            rows = []
+            append = rows.append
+            for hadith, chains in zip(batch, extract_chains_from_results(batch)):
+                hadith_get = hadith.get
+                hadith_index = hadith_get("hadith_index", "")
+                hadith_text = hadith_get("hadith_text", "")
+                n_chains = len(chains)
+
+                # Format chains as JSON object
+                if chains:
+                    chains_dict = {
+                        f"chain_{i+1}": format_chain(chain)
+                        for i, chain in enumerate(chains)
+                    }
+                    all_chains_json = dumps(chains_dict)
+                else:
+                    all_chains_json = NO_CHAIN_JSON
+
+                # Row in fieldnames order; validation_status and notes start empty
+                append((hadith_index, hadith_text, n_chains, all_chains_json, "", ""))
+
+            writer.writerows(rows)
+            hadith_count += len(rows)
 
     print(f"✓ Exported {hadith_count} hadiths to {output_path} ({source_label})")
     return hadith_count
@@ -7,20 +7,272 @@ Exports:
 2. JSON format (for programmatic use)
 """
 
+import gzip
 import os
+import shutil
 import sys
-import json
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from functools import partial
+from typing import BinaryIO, Dict, Iterator, Any, Tuple
+
+import json_utils
 
 try:
     from neo4j import GraphDatabase
+    from neo4j.exceptions import ClientError
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
     print("Please install: pip install neo4j python-dotenv")
     sys.exit(1)
 
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, only needed for .zst output
+    zstandard = None
+
+try:
+    import pandas
+except ImportError:  # pandas is optional, only needed for the CSV export
+    pandas = None
+
+
+# Large write buffer so the rendered sections go out in few syscalls
+OUTPUT_BUFFER_SIZE = 8 << 20
+
+# Output is compressed when the file name ends in .gz or .zst; fast levels,
+# since the repeated Cypher/JSON keys compress well even at level 1
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+
+# Each concurrently rendered section stays in memory up to this size and then
+# spills to a temporary file, so peak RAM is bounded by sections x this size
+SECTION_SPOOL_SIZE = 32 << 20
+
+
+@contextmanager
+def open_output(path: str):
+    """Open an export file for binary writing, compressing it by suffix (.gz / .zst)."""
+    if path.endswith(".gz"):
+        with gzip.open(path, "wb", compresslevel=GZIP_LEVEL) as f:
+            yield f
+    elif path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Writing .zst exports requires: pip install zstandard")
+        with open(path, "wb") as raw, zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw) as f:
+            yield f
+    else:
+        with open(path, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+            yield f
+
+# Read queries shared by the Cypher and JSON exporters
+NARRATORS_QUERY = "MATCH (n:Narrator) RETURN n.source AS source, n.norm AS norm, n.name AS name"
+HADITHS_QUERY = "MATCH (h:Hadith) RETURN h.source AS source, h.hadith_index AS idx, h.text AS text"
+CHAINS_QUERY = "MATCH (c:Chain) RETURN c.source AS source, c.hadith_index AS idx, c.chain_id AS cid, c.length AS length"
+HAS_CHAIN_QUERY = """
+    MATCH (h:Hadith)-[:HAS_CHAIN]->(c:Chain)
+    RETURN h.source AS source, h.hadith_index AS idx, c.chain_id AS cid
+"""
+POSITION_QUERY = """
+    MATCH (c:Chain)-[p:POSITION]->(n:Narrator)
+    RETURN c.source AS source, c.hadith_index AS idx, c.chain_id AS cid, p.pos AS pos, n.norm AS norm
+"""
+TRANSMITTED_TO_QUERY = """
+    MATCH (n1:Narrator)-[t:TRANSMITTED_TO]->(n2:Narrator)
+    RETURN n1.source AS source, n1.norm AS from_norm, n2.norm AS to_norm,
+           t.count AS count, t.hadith_indices AS indices
+"""
+
+# One CSV file per section in the tabular export
+CSV_SECTIONS = [
+    ("narrators", NARRATORS_QUERY),
+    ("hadiths", HADITHS_QUERY),
+    ("chains", CHAINS_QUERY),
+    ("has_chain", HAS_CHAIN_QUERY),
+    ("position", POSITION_QUERY),
+    ("transmitted_to", TRANSMITTED_TO_QUERY),
+]
+
+
+# =============================================================================
+# CYPHER RENDERING
+# =============================================================================
+
+# Escapes for single-quoted Cypher string literals, applied in one pass.
+# Backslashes must be escaped too, or a trailing "\" swallows the closing quote.
+_CYPHER_ESCAPE = str.maketrans({
+    "\\": "\\\\",
+    "'": "\\'",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+# One UNWIND statement per section; rows are bound with :param before each batch
+UNWIND_BATCH_SIZE = 1000
+NARRATORS_MERGE = "UNWIND $rows AS r MERGE (n:Narrator {source: r.source, norm: r.norm}) SET n.name = r.name"
+HADITHS_MERGE = "UNWIND $rows AS r MERGE (h:Hadith {source: r.source, hadith_index: r.hadith_index}) SET h.text = coalesce(r.text, '')"
+CHAINS_MERGE = (
+    "UNWIND $rows AS r MERGE (c:Chain {source: r.source, hadith_index: r.hadith_index, chain_id: r.chain_id}) "
+    "SET c.length = r.length"
+)
+HAS_CHAIN_MERGE = (
+    "UNWIND $rows AS r "
+    "MATCH (h:Hadith {source: r.source, hadith_index: r.hadith_index}) "
+    "MATCH (c:Chain {source: r.source, hadith_index: r.hadith_index, chain_id: r.chain_id}) "
+    "MERGE (h)-[:HAS_CHAIN]->(c)"
+)
+POSITION_MERGE = (
+    "UNWIND $rows AS r "
+    "MATCH (c:Chain {source: r.source, hadith_index: r.hadith_index, chain_id: r.chain_id}) "
+    "MATCH (n:Narrator {source: r.source, norm: r.narrator_norm}) "
+    "MERGE (c)-[:POSITION {pos: r.pos}]->(n)"
+)
+TRANSMITTED_TO_MERGE = (
+    "UNWIND $rows AS r "
+    "MATCH (n1:Narrator {source: r.source, norm: r.from_norm}) "
+    "MATCH (n2:Narrator {source: r.source, norm: r.to_norm}) "
+    "MERGE (n1)-[t:TRANSMITTED_TO]->(n2) SET t.count = r.count, t.hadith_indices = r.hadith_indices"
+)
+
+
+def _cypher_literal(value: Any) -> str:
+    """Render a Python value as a Cypher literal (maps get unquoted keys)."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return "'" + value.translate(_CYPHER_ESCAPE) + "'"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(map(_cypher_literal, value)) + "]"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{key}: {_cypher_literal(item)}" for key, item in value.items()) + "}"
+    return repr(value)
+
+
+def _unwind_to_cypher(f, result, row_to_obj, statement: str) -> int:
+    """
+    Write a section as `:param rows => [...]` + UNWIND pairs of up to
+    UNWIND_BATCH_SIZE rows, so the import runs one statement per batch.
+    Each batch is encoded once and written to a binary buffer.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    rows = []
+
+    def flush():
+        f.write((":param rows => [" + ", ".join(rows) + "]\n" + statement + ";\n").encode("utf-8"))
+        rows.clear()
+
+    literal = _cypher_literal
+    template = None
+    for record in result:
+        obj = row_to_obj(record)
+        if template is None:
+            # Rows of a section share their keys, so the map template is built once
+            template = "{" + ", ".join(f"{key}: %s" for key in obj) + "}"
+        rows.append(template % tuple(map(literal, obj.values())))
+        count += 1
+        if len(rows) >= UNWIND_BATCH_SIZE:
+            flush()
+    if rows:
+        flush()
+    return count
+
+
+# =============================================================================
+# JSON ROW CONVERTERS
+# =============================================================================
+
+def _narrator_json(record) -> Dict[str, Any]:
+    return {"source": record["source"], "norm": record["norm"], "name": record["name"]}
+
+
+def _hadith_json(record) -> Dict[str, Any]:
+    return {"source": record["source"], "hadith_index": record["idx"], "text": record["text"]}
+
+
+def _chain_json(record) -> Dict[str, Any]:
+    return {
+        "source": record["source"],
+        "hadith_index": record["idx"],
+        "chain_id": record["cid"],
+        "length": record["length"]
+    }
+
+
+def _has_chain_json(record) -> Dict[str, Any]:
+    return {"source": record["source"], "hadith_index": record["idx"], "chain_id": record["cid"]}
+
+
+def _position_json(record) -> Dict[str, Any]:
+    return {
+        "source": record["source"],
+        "hadith_index": record["idx"],
+        "chain_id": record["cid"],
+        "pos": record["pos"],
+        "narrator_norm": record["norm"]
+    }
+
+
+def _transmitted_to_json(record) -> Dict[str, Any]:
+    return {
+        "source": record["source"],
+        "from_norm": record["from_norm"],
+        "to_norm": record["to_norm"],
+        "count": record["count"],
+        "hadith_indices": record["indices"] or []
+    }
+
+
+def _json_row(row_to_obj):
+    """Wrap a row converter so it returns the row as compact JSON bytes."""
+    dumps_bytes = json_utils.dumps_bytes
+
+    def encode(record) -> bytes:
+        return dumps_bytes(row_to_obj(record))
+    return encode
+
+
+# Fixed-shape rows made of a few ints and strings are formatted straight into
+# bytes; only the string fields go through the JSON encoder. If an int field
+# is missing (None), %d raises TypeError and the generic encoder is used.
+_CHAIN_JSON = b'{"source":%s,"hadith_index":%d,"chain_id":%d,"length":%d}'
+_HAS_CHAIN_JSON = b'{"source":%s,"hadith_index":%d,"chain_id":%d}'
+_POSITION_JSON = b'{"source":%s,"hadith_index":%d,"chain_id":%d,"pos":%d,"narrator_norm":%s}'
+
+
+def _chain_json_bytes(record) -> bytes:
+    try:
+        return _CHAIN_JSON % (
+            json_utils.dumps_bytes(record["source"]), record["idx"], record["cid"], record["length"]
+        )
+    except TypeError:
+        return json_utils.dumps_bytes(_chain_json(record))
+
+
+def _has_chain_json_bytes(record) -> bytes:
+    try:
+        return _HAS_CHAIN_JSON % (json_utils.dumps_bytes(record["source"]), record["idx"], record["cid"])
+    except TypeError:
+        return json_utils.dumps_bytes(_has_chain_json(record))
+
+
+def _position_json_bytes(record) -> bytes:
+    try:
+        return _POSITION_JSON % (
+            json_utils.dumps_bytes(record["source"]), record["idx"], record["cid"], record["pos"],
+            json_utils.dumps_bytes(record["norm"])
+        )
+    except TypeError:
+        return json_utils.dumps_bytes(_position_json(record))
+
 
 class DatabaseExporter:
     """Export Neo4j database to various formats."""
@@ -46,208 +298,208 @@ class DatabaseExporter:
     def __exit__(self, *args):
         self.close()
 
-    def export_to_cypher(self, output_file: str = "hadith_graph_export.cypher") -> str:
-        """Export entire database to Cypher statements."""
-        print(f"Exporting to Cypher: {output_file}")
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # Header
-            f.write("// Hadith Graph Database Export\n")
-            f.write(f"// Exported: {datetime.now().isoformat()}\n")
-            f.write("// Schema: V2 (Chain nodes + POSITION + TRANSMITTED_TO)\n")
-            f.write("//\n")
-            f.write("// To import: Run this file in Neo4j Browser or cypher-shell\n")
-            f.write("// Note: Clear database first with: MATCH (n) DETACH DELETE n\n\n")
-
-            # Constraints
-            f.write("// === CONSTRAINTS ===\n")
-            f.write("CREATE CONSTRAINT narrator_unique IF NOT EXISTS FOR (n:Narrator) REQUIRE (n.source, n.norm) IS UNIQUE;\n")
-            f.write("CREATE CONSTRAINT hadith_unique IF NOT EXISTS FOR (h:Hadith) REQUIRE (h.source, h.hadith_index) IS UNIQUE;\n")
-            f.write("CREATE CONSTRAINT chain_unique IF NOT EXISTS FOR (c:Chain) REQUIRE (c.source, c.hadith_index, c.chain_id) IS UNIQUE;\n\n")
+    def export_via_apoc(self, output_file: str) -> bool:
+        """
+        Export the whole graph to Cypher using APOC's server-side exporter.
 
-            with self.driver.session() as session:
-                # Export Narrators
-                f.write("// === NARRATORS ===\n")
-                result = session.run("MATCH (n:Narrator) RETURN n.source AS source, n.norm AS norm, n.name AS name")
-                count = 0
-                for record in result:
-                    name_escaped = record["name"].replace("'", "\\'").replace('"', '\\"')
-                    norm_escaped = record["norm"].replace("'", "\\'").replace('"', '\\"')
-                    f.write(f"MERGE (n:Narrator {{source: '{record['source']}', norm: '{norm_escaped}'}}) SET n.name = '{name_escaped}';\n")
-                    count += 1
-                print(f"  Exported {count} narrators")
-
-                # Export Hadiths
-                f.write("\n// === HADITHS ===\n")
-                result = session.run("MATCH (h:Hadith) RETURN h.source AS source, h.hadith_index AS idx, h.text AS text")
-                count = 0
-                for record in result:
-                    text_escaped = record["text"].replace("'", "\\'").replace('"', '\\"').replace("\n", "\\n") if record["text"] else ""
-                    f.write(f"MERGE (h:Hadith {{source: '{record['source']}', hadith_index: {record['idx']}}}) SET h.text = '{text_escaped}';\n")
-                    count += 1
-                print(f"  Exported {count} hadiths")
-
-                # Export Chains
-                f.write("\n// === CHAINS ===\n")
-                result = session.run("MATCH (c:Chain) RETURN c.source AS source, c.hadith_index AS idx, c.chain_id AS cid, c.length AS length")
-                count = 0
-                for record in result:
-                    f.write(f"MERGE (c:Chain {{source: '{record['source']}', hadith_index: {record['idx']}, chain_id: {record['cid']}}}) SET c.length = {record['length']};\n")
-                    count += 1
-                print(f"  Exported {count} chains")
+        Statements are generated inside Neo4j and streamed back, so no per-row
+        Python formatting is needed. Uses UNWIND batches for fast re-import.
 
-                # Export HAS_CHAIN relationships
-                f.write("\n// === HAS_CHAIN RELATIONSHIPS ===\n")
-                result = session.run("""
-                    MATCH (h:Hadith)-[:HAS_CHAIN]->(c:Chain)
-                    RETURN h.source AS source, h.hadith_index AS idx, c.chain_id AS cid
-                """)
-                count = 0
-                for record in result:
-                    f.write(f"MATCH (h:Hadith {{source: '{record['source']}', hadith_index: {record['idx']}}}) ")
-                    f.write(f"MATCH (c:Chain {{source: '{record['source']}', hadith_index: {record['idx']}, chain_id: {record['cid']}}}) ")
-                    f.write("MERGE (h)-[:HAS_CHAIN]->(c);\n")
-                    count += 1
-                print(f"  Exported {count} HAS_CHAIN relationships")
-
-                # Export POSITION relationships
-                f.write("\n// === POSITION RELATIONSHIPS ===\n")
+        Returns:
+            True if the export was written, False if APOC is not installed
+        """
+        try:
+            with self.driver.session() as session, open_output(output_file) as f:
                 result = session.run("""
-                    MATCH (c:Chain)-[p:POSITION]->(n:Narrator)
-                    RETURN c.source AS source, c.hadith_index AS idx, c.chain_id AS cid, p.pos AS pos, n.norm AS norm
+                    CALL apoc.export.cypher.all(null, {
+                        stream: true,
+                        format: 'cypher-shell',
+                        useOptimizations: {type: 'UNWIND_BATCH', unwindBatchSize: 1000}
+                    })
+                    YIELD cypherStatements
+                    RETURN cypherStatements
                 """)
-                count = 0
+                f.write("// Hadith Graph Database Export (APOC)\n".encode("utf-8"))
+                f.write(f"// Exported: {datetime.now().isoformat()}\n\n".encode("utf-8"))
                 for record in result:
-                    norm_escaped = record["norm"].replace("'", "\\'")
-                    f.write(f"MATCH (c:Chain {{source: '{record['source']}', hadith_index: {record['idx']}, chain_id: {record['cid']}}}) ")
-                    f.write(f"MATCH (n:Narrator {{source: '{record['source']}', norm: '{norm_escaped}'}}) ")
-                    f.write(f"MERGE (c)-[:POSITION {{pos: {record['pos']}}}]->(n);\n")
-                    count += 1
-                print(f"  Exported {count} POSITION relationships")
-
-                # Export TRANSMITTED_TO relationships
-                f.write("\n// === TRANSMITTED_TO RELATIONSHIPS ===\n")
-                result = session.run("""
-                    MATCH (n1:Narrator)-[t:TRANSMITTED_TO]->(n2:Narrator)
-                    RETURN n1.source AS source, n1.norm AS from_norm, n2.norm AS to_norm, 
-                           t.count AS count, t.hadith_indices AS indices
-                """)
-                count = 0
-                for record in result:
-                    from_escaped = record["from_norm"].replace("'", "\\'")
-                    to_escaped = record["to_norm"].replace("'", "\\'")
-                    indices = record["indices"] if record["indices"] else []
-                    f.write(f"MATCH (n1:Narrator {{source: '{record['source']}', norm: '{from_escaped}'}}) ")
-                    f.write(f"MATCH (n2:Narrator {{source: '{record['source']}', norm: '{to_escaped}'}}) ")
-                    f.write(f"MERGE (n1)-[t:TRANSMITTED_TO]->(n2) SET t.count = {record['count']}, t.hadith_indices = {indices};\n")
-                    count += 1
-                print(f"  Exported {count} TRANSMITTED_TO relationships")
+                    f.write(record["cypherStatements"].encode("utf-8"))
+        except ClientError as e:
+            if e.code != "Neo.ClientError.Procedure.ProcedureNotFound":
+                raise
+            print("  APOC not available, falling back to Python export")
+            return False
+
+        print(f"\n✅ Export complete (APOC): {output_file}")
+        return True
+
+    def _run_sections(self, sections) -> Iterator[Tuple[BinaryIO, int]]:
+        """
+        Run the section queries concurrently, one session per query.
+
+        Each query is rendered into its own spooled temporary file, kept in
+        memory up to SECTION_SPOOL_SIZE and spilled to disk beyond that.
+        Sections are yielded in the order given as soon as each one is
+        ready, so the caller writes earlier sections out while later
+        queries are still running.
+
+        Args:
+            sections: (query, render) pairs, where render(buffer, result) returns a count
+
+        Yields:
+            (rendered file rewound to the start, count) per section, in the
+            order given; the caller copies and closes the file
+        """
+        def run(query, render):
+            buffer = tempfile.SpooledTemporaryFile(max_size=SECTION_SPOOL_SIZE)
+            try:
+                with self.driver.session() as session:
+                    count = render(buffer, session.run(query))
+            except BaseException:
+                buffer.close()
+                raise
+            buffer.seek(0)
+            return buffer, count
+
+        with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+            futures = [pool.submit(run, query, render) for query, render in sections]
+            for i, future in enumerate(futures):
+                # Drop the reference once handed over so written sections can be freed
+                futures[i] = None
+                yield future.result()
+
+    def export_to_cypher(self, output_file: str = "hadith_graph_export.cypher", use_apoc: bool = False) -> str:
+        """Export entire database to Cypher statements."""
+        print(f"Exporting to Cypher: {output_file}")
+        if use_apoc and self.export_via_apoc(output_file):
+            return output_file
+
+        def unwind(row_to_obj, statement):
+            return partial(_unwind_to_cypher, row_to_obj=row_to_obj, statement=statement)
+
+        sections = [
+            ("NARRATORS", "narrators", NARRATORS_QUERY, unwind(_narrator_json, NARRATORS_MERGE)),
+            ("HADITHS", "hadiths", HADITHS_QUERY, unwind(_hadith_json, HADITHS_MERGE)),
+            ("CHAINS", "chains", CHAINS_QUERY, unwind(_chain_json, CHAINS_MERGE)),
+            ("HAS_CHAIN RELATIONSHIPS", "HAS_CHAIN relationships", HAS_CHAIN_QUERY,
+             unwind(_has_chain_json, HAS_CHAIN_MERGE)),
+            ("POSITION RELATIONSHIPS", "POSITION relationships", POSITION_QUERY,
+             unwind(_position_json, POSITION_MERGE)),
+            ("TRANSMITTED_TO RELATIONSHIPS", "TRANSMITTED_TO relationships", TRANSMITTED_TO_QUERY,
+             unwind(_transmitted_to_json, TRANSMITTED_TO_MERGE)),
+        ]
+        rendered = self._run_sections([(query, render) for _, _, query, render in sections])
+
+        header = (
+            "// Hadith Graph Database Export\n"
+            f"// Exported: {datetime.now().isoformat()}\n"
+            "// Schema: V2 (Chain nodes + POSITION + TRANSMITTED_TO)\n"
+            "//\n"
+            "// To import: Run this file with cypher-shell (uses :param + UNWIND batches)\n"
+            "// Note: Clear database first with: MATCH (n) DETACH DELETE n\n\n"
+            "// === CONSTRAINTS ===\n"
+            "CREATE CONSTRAINT narrator_unique IF NOT EXISTS FOR (n:Narrator) REQUIRE (n.source, n.norm) IS UNIQUE;\n"
+            "CREATE CONSTRAINT hadith_unique IF NOT EXISTS FOR (h:Hadith) REQUIRE (h.source, h.hadith_index) IS UNIQUE;\n"
+            "CREATE CONSTRAINT chain_unique IF NOT EXISTS FOR (c:Chain) REQUIRE (c.source, c.hadith_index, c.chain_id) IS UNIQUE;\n"
+        )
+
+        with open_output(output_file) as f:
+            f.write(header.encode("utf-8"))
+            for (title, label, _, _), (data, count) in zip(sections, rendered):
+                f.write(f"\n// === {title} ===\n".encode("utf-8"))
+                with data:
+                    shutil.copyfileobj(data, f, OUTPUT_BUFFER_SIZE)
+                print(f"  Exported {count} {label}")
 
         print(f"\n✅ Export complete: {output_file}")
         return output_file
 
+    @staticmethod
+    def _stream_array(f, result, name: str, encode_row, indent: bytes = b"  ") -> int:
+        """
+        Render a Neo4j result as a JSON array on a binary file.
+
+        Produces `"name": [` followed by one serialized record per line. Each
+        record is written to f as soon as it arrives from the result, so only
+        one encoded record is held at a time.
+        encode_row(record) must return the record as compact JSON bytes.
+
+        Returns:
+            Number of records written
+        """
+        prefix = indent + b"  "
+        count = 0
+        f.write(indent + json_utils.dumps_bytes(name) + b": [")
+        for record in result:
+            f.write((b",\n" if count else b"\n") + prefix + encode_row(record))
+            count += 1
+        f.write(b"\n" + indent + b"]" if count else b"]")
+        return count
+
     def export_to_json(self, output_file: str = "hadith_graph_export.json") -> str:
-        """Export entire database to JSON format."""
+        """Export entire database to JSON format, running the section queries in parallel."""
         print(f"Exporting to JSON: {output_file}")
-        
-        data = {
-            "metadata": {
-                "exported": datetime.now().isoformat(),
-                "schema_version": "v2",
-                "description": "Hadith Narrator Knowledge Graph"
-            },
-            "narrators": [],
-            "hadiths": [],
-            "chains": [],
-            "relationships": {
-                "has_chain": [],
-                "position": [],
-                "transmitted_to": []
-            }
+
+        metadata = {
+            "exported": datetime.now().isoformat(),
+            "schema_version": "v2",
+            "description": "Hadith Narrator Knowledge Graph"
         }
 
-        with self.driver.session() as session:
-            # Export Narrators
-            result = session.run("MATCH (n:Narrator) RETURN n.source AS source, n.norm AS norm, n.name AS name")
-            for record in result:
-                data["narrators"].append({
-                    "source": record["source"],
-                    "norm": record["norm"],
-                    "name": record["name"]
-                })
-            print(f"  Exported {len(data['narrators'])} narrators")
-
-            # Export Hadiths
-            result = session.run("MATCH (h:Hadith) RETURN h.source AS source, h.hadith_index AS idx, h.text AS text")
-            for record in result:
-                data["hadiths"].append({
-                    "source": record["source"],
-                    "hadith_index": record["idx"],
-                    "text": record["text"]
-                })
-            print(f"  Exported {len(data['hadiths'])} hadiths")
-
-            # Export Chains
-            result = session.run("MATCH (c:Chain) RETURN c.source AS source, c.hadith_index AS idx, c.chain_id AS cid, c.length AS length")
-            for record in result:
-                data["chains"].append({
-                    "source": record["source"],
-                    "hadith_index": record["idx"],
-                    "chain_id": record["cid"],
-                    "length": record["length"]
-                })
-            print(f"  Exported {len(data['chains'])} chains")
-
-            # Export HAS_CHAIN
-            result = session.run("""
-                MATCH (h:Hadith)-[:HAS_CHAIN]->(c:Chain)
-                RETURN h.source AS source, h.hadith_index AS idx, c.chain_id AS cid
-            """)
-            for record in result:
-                data["relationships"]["has_chain"].append({
-                    "source": record["source"],
-                    "hadith_index": record["idx"],
-                    "chain_id": record["cid"]
-                })
-            print(f"  Exported {len(data['relationships']['has_chain'])} HAS_CHAIN relationships")
-
-            # Export POSITION
-            result = session.run("""
-                MATCH (c:Chain)-[p:POSITION]->(n:Narrator)
-                RETURN c.source AS source, c.hadith_index AS idx, c.chain_id AS cid, p.pos AS pos, n.norm AS norm
-            """)
-            for record in result:
-                data["relationships"]["position"].append({
-                    "source": record["source"],
-                    "hadith_index": record["idx"],
-                    "chain_id": record["cid"],
-                    "pos": record["pos"],
-                    "narrator_norm": record["norm"]
-                })
-            print(f"  Exported {len(data['relationships']['position'])} POSITION relationships")
-
-            # Export TRANSMITTED_TO
-            result = session.run("""
-                MATCH (n1:Narrator)-[t:TRANSMITTED_TO]->(n2:Narrator)
-                RETURN n1.source AS source, n1.norm AS from_norm, n2.norm AS to_norm, 
-                       t.count AS count, t.hadith_indices AS indices
-            """)
-            for record in result:
-                data["relationships"]["transmitted_to"].append({
-                    "source": record["source"],
-                    "from_norm": record["from_norm"],
-                    "to_norm": record["to_norm"],
-                    "count": record["count"],
-                    "hadith_indices": record["indices"] or []
-                })
-            print(f"  Exported {len(data['relationships']['transmitted_to'])} TRANSMITTED_TO relationships")
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        def array(name, encode_row, indent=b"  "):
+            return partial(self._stream_array, name=name, encode_row=encode_row, indent=indent)
+
+        sections = [
+            ("narrators", NARRATORS_QUERY, array("narrators", _json_row(_narrator_json))),
+            ("hadiths", HADITHS_QUERY, array("hadiths", _json_row(_hadith_json))),
+            ("chains", CHAINS_QUERY, array("chains", _chain_json_bytes)),
+            ("HAS_CHAIN relationships", HAS_CHAIN_QUERY, array("has_chain", _has_chain_json_bytes, b"    ")),
+            ("POSITION relationships", POSITION_QUERY, array("position", _position_json_bytes, b"    ")),
+            ("TRANSMITTED_TO relationships", TRANSMITTED_TO_QUERY, array("transmitted_to", _json_row(_transmitted_to_json), b"    ")),
+        ]
+        rendered = self._run_sections([(query, render) for _, query, render in sections])
+        # Separator written after each section; relationships are nested one level deeper
+        separators = [b",\n", b",\n", b',\n  "relationships": {\n', b",\n", b",\n", b"\n  }\n}\n"]
+
+        with open_output(output_file) as f:
+            f.write(b'{\n  "metadata": ' + json_utils.dumps_bytes(metadata) + b",\n")
+            for (label, _, _), (data, count), separator in zip(sections, rendered, separators):
+                with data:
+                    shutil.copyfileobj(data, f, OUTPUT_BUFFER_SIZE)
+                f.write(separator)
+                print(f"  Exported {count} {label}")
 
         print(f"\n✅ Export complete: {output_file}")
         return output_file
 
+    def export_to_csv(self, output_dir: str = "hadith_graph_export_csv") -> str:
+        """
+        Export each section to its own CSV file.
+
+        Results are fetched in bulk with Result.to_df() and written with
+        DataFrame.to_csv, so no per-record Python formatting is done.
+        List columns (hadith_indices) are stored as JSON arrays.
+        """
+        if pandas is None:
+            raise RuntimeError("CSV export requires: pip install pandas")
+        print(f"Exporting to CSV: {output_dir}/")
+        os.makedirs(output_dir, exist_ok=True)
+
+        def run(name, query):
+            with self.driver.session() as session:
+                df = session.run(query).to_df()
+            if "indices" in df.columns:
+                df["indices"] = df["indices"].map(lambda indices: json_utils.dumps(indices or []))
+            df.to_csv(os.path.join(output_dir, f"{name}.csv"), index=False)
+            return len(df)
+
+        with ThreadPoolExecutor(max_workers=len(CSV_SECTIONS)) as pool:
+            futures = [pool.submit(run, name, query) for name, query in CSV_SECTIONS]
+            for (name, _), future in zip(CSV_SECTIONS, futures):
+                print(f"  Exported {future.result()} rows to {name}.csv")
+
+        print(f"\n✅ Export complete: {output_dir}/")
+        return output_dir
+
 
 def main():
     import argparse
@@ -255,29 +507,43 @@ def main():
     parser = argparse.ArgumentParser(description="Export Neo4j hadith graph database")
     parser.add_argument(
         "--format", "-f",
-        choices=["cypher", "json", "both"],
+        choices=["cypher", "json", "both", "csv"],
         default="both",
-        help="Export format (default: both)"
+        help="Export format (default: both = cypher + json; csv needs pandas)"
     )
     parser.add_argument(
         "--output", "-o",
         help="Output filename (without extension)"
     )
+    parser.add_argument(
+        "--compress",
+        choices=["gz", "zst"],
+        help="Compress the export files (gzip, or zstd if zstandard is installed)"
+    )
+    parser.add_argument(
+        "--apoc",
+        action="store_true",
+        help="Generate the Cypher export server-side with APOC (falls back to Python if unavailable)"
+    )
     
     args = parser.parse_args()
     
     base_name = args.output or "hadith_graph_export"
+    suffix = f".{args.compress}" if args.compress else ""
     
     try:
         with DatabaseExporter() as exporter:
             print("Connected to Neo4j\n")
             
             if args.format in ["cypher", "both"]:
-                exporter.export_to_cypher(f"{base_name}.cypher")
+                exporter.export_to_cypher(f"{base_name}.cypher{suffix}", use_apoc=args.apoc)
                 print()
             
             if args.format in ["json", "both"]:
-                exporter.export_to_json(f"{base_name}.json")
+                exporter.export_to_json(f"{base_name}.json{suffix}")
+
+            if args.format == "csv":
+                exporter.export_to_csv(f"{base_name}_csv")
             
             print("\n" + "=" * 50)
             print("Export files ready for sharing!")
@@ -287,7 +553,7 @@ def main():
             print("  2. Clear database: MATCH (n) DETACH DELETE n")
             print("  3. Copy/paste or run the .cypher file")
             print("\nTo import JSON file:")
-            print("  python import_database.py hadith_graph_export.json")
+            print(f"  python import_database.py {base_name}.json{suffix}")
             
     except Exception as e:
         print(f"Error: {e}")
@@ -1,7 +1,16 @@
 import csv
-import json
 from collections import Counter
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable
+
+import json_utils
+
+# Rows are buffered and flushed with writerows to keep write() calls few
+ROWS_PER_FLUSH = 1024
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Shared read-only defaults for missing keys, so none are allocated per narrator
+_EMPTY: Dict[str, Any] = {}
+_EMPTY_TUPLE: tuple = ()
 
 
 def export_narrator_occurrences(input_path: str, output_path: str, source_label: str) -> int:
@@ -18,47 +27,42 @@ def export_narrator_occurrences(input_path: str, output_path: str, source_label:
     Returns:
         Number of rows written (excluding header).
     """
-    with open(input_path, "r", encoding="utf-8") as f:
-        hadiths: List[Dict[str, Any]] = json.load(f)
+    hadiths: Iterable[Dict[str, Any]] = json_utils.iter_items(input_path)
 
     row_count = 0
-    with open(output_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["narrator_name", "hadith_index", "hadith_text", "role", "n_occurrence"],
-            extrasaction="ignore",
-        )
-        writer.writeheader()
+    with open(output_path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(("narrator_name", "hadith_index", "hadith_text", "role", "n_occurrence"))
 
+        # Single pass: count every occurrence, keep the row of the first one
         name_counts: Counter[str] = Counter()
+        first_row: Dict[str, tuple] = {}
+        # Hot loop: bound methods hoisted to locals
+        count_get = name_counts.get
         for hadith in hadiths:
-            for narrator in hadith.get("narrators", []):
-                name = narrator.get("name", "")
-                if name:
-                    name_counts[name] += 1
-
-        seen_names = set()
-        for hadith in hadiths:
-            hadith_index = hadith.get("hadith_index", "")
-            hadith_text = hadith.get("hadith_text", "")
-            narrators: Iterable[Dict[str, Any]] = hadith.get("narrators", [])
+            hadith_get = hadith.get
+            hadith_index = hadith_get("hadith_index", "")
+            hadith_text = hadith_get("hadith_text", "")
+            narrators: Iterable[Dict[str, Any]] = hadith_get("narrators") or _EMPTY_TUPLE
 
             for narrator in narrators:
                 name = narrator.get("name", "")
-                if not name or name in seen_names:
+                if not name:
                     continue
-                role = narrator.get("attributes", {}).get("role", "")
-                writer.writerow(
-                    {
-                        "narrator_name": name,
-                        "hadith_index": hadith_index,
-                        "hadith_text": hadith_text,
-                        "role": role,
-                        "n_occurrence": name_counts[name],
-                    }
-                )
-                seen_names.add(name)
-                row_count += 1
+                name_counts[name] = count_get(name, 0) + 1
+                if name not in first_row:
+                    role = (narrator.get("attributes") or _EMPTY).get("role", "")
+                    first_row[name] = (hadith_index, hadith_text, role)
+
+        rows = []
+        for name, (hadith_index, hadith_text, role) in first_row.items():
+            rows.append((name, hadith_index, hadith_text, role, name_counts[name]))
+            row_count += 1
+            if len(rows) >= ROWS_PER_FLUSH:
+                writer.writerows(rows)
+                rows.clear()
+
+        writer.writerows(rows)
 
     print(f"✓ Wrote {row_count} rows to {output_path} ({source_label})")
     return row_count
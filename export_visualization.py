@@ -2,25 +2,259 @@
 """
 Export hadith chains to beautiful interactive HTML visualizations.
 
-Uses pyvis for clean, interactive graph rendering.
-Install: pip install pyvis
+Renders the node/edge data straight into a vis-network HTML page.
+Install: pip install networkx neo4j python-dotenv
 """
 
+import atexit
+import json
 import os
+import string
 import sys
+import threading
+from html import escape as html_escape
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Any
 
 try:
-    from pyvis.network import Network
+    import networkx as nx
     from neo4j import GraphDatabase
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError as e:
     print(f"Missing dependency: {e}")
-    print("Install with: pip install pyvis neo4j python-dotenv")
+    print("Install with: pip install networkx neo4j python-dotenv")
     sys.exit(1)
 
 
+def _apply_defaults(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> None:
+    """
+    Fill in the per-item defaults of a directed graph: dot-shaped nodes
+    with dark labels, and arrows on every edge.
+    """
+    for node in nodes:
+        node.setdefault("shape", "dot")
+        node.setdefault("font", {"color": FONT_COLOR})
+    for edge in edges:
+        edge.setdefault("arrows", "to")
+
+
+def _freeze_layout(
+    options: Dict[str, Any],
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Give every node a precomputed (x, y) from a spring layout and return
+    `options` with in-browser physics turned off, so the page renders
+    without a simulation pass.
+    """
+    graph = nx.Graph()
+    graph.add_nodes_from(node["id"] for node in nodes)
+    graph.add_edges_from((edge["from"], edge["to"]) for edge in edges)
+    try:
+        positions = nx.spring_layout(graph, seed=42, scale=1000)
+    except ImportError:
+        # spring_layout needs numpy; without it keep the in-browser layout
+        return options
+
+    for node in nodes:
+        x, y = positions[node["id"]]
+        node["x"] = float(x)
+        node["y"] = float(y)
+
+    return {**options, "physics": {**options.get("physics", {}), "enabled": False}}
+
+
+# Page shell shared by every export: vis-network from the CDN plus the RTL
+# stylesheet. Only the graph data and options differ per page.
+HTML_SHELL = string.Template("""<!DOCTYPE html>
+<html dir="rtl">
+<head>
+    <meta charset="utf-8">
+    <title>$title</title>
+    <script src="$vis_js"></script>
+    <style>
+        body { direction: rtl; font-family: 'Arial', sans-serif; margin: 0; }
+        h1, h2, h3, p { direction: rtl; text-align: right; }
+        #mynetwork {
+            width: $width;
+            height: $height;
+            background-color: $bgcolor;
+            border: 1px solid lightgray;
+        }
+    </style>
+</head>
+<body>
+    <div id="mynetwork"></div>
+    <script type="text/javascript">
+        var nodes = new vis.DataSet($nodes);
+        var edges = new vis.DataSet($edges);
+        var network = new vis.Network(
+            document.getElementById("mynetwork"),
+            {nodes: nodes, edges: edges},
+            $options
+        );
+    </script>
+</body>
+</html>
+""")
+VIS_JS_URL = "https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js"
+PAGE_WIDTH, PAGE_HEIGHT = "100%", "700px"
+BACKGROUND_COLOR = "#ffffff"
+FONT_COLOR = "#333333"
+
+
+def _script_json(obj: Any) -> str:
+    """JSON for embedding inside a <script> block."""
+    return json.dumps(obj, ensure_ascii=False).replace("</", "<\\/")
+
+
+def _save_html(
+    output_file: str,
+    title: str,
+    nodes: List[Dict[str, Any]],
+    edges: List[Dict[str, Any]],
+    options: Dict[str, Any]
+) -> None:
+    """Write the graph into HTML_SHELL as a single UTF-8 file."""
+    html = HTML_SHELL.substitute(
+        title=html_escape(title),
+        vis_js=VIS_JS_URL,
+        width=PAGE_WIDTH,
+        height=PAGE_HEIGHT,
+        bgcolor=BACKGROUND_COLOR,
+        nodes=_script_json(nodes),
+        edges=_script_json(edges),
+        options=json.dumps(options).replace("</", "<\\/"),
+    )
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+
+# Every TRANSMITTED_TO edge within `depth` hops of the center. Each prefix of a
+# matched path is itself a match, so last(r) alone covers every edge and no
+# UNWIND of whole paths is needed. One fixed query text per depth (1-3) keeps
+# the server's plan cache warm.
+NARRATOR_NETWORK_QUERIES = {
+    depth: f"""
+        MATCH (center:Narrator {{source: $source, norm: $norm}})
+        MATCH (center)-[r:TRANSMITTED_TO*1..{depth}]-(:Narrator)
+        WITH DISTINCT last(r) AS rel
+        RETURN startNode(rel).name AS from_name,
+               startNode(rel).norm AS from_norm,
+               endNode(rel).name AS to_name,
+               endNode(rel).norm AS to_norm,
+               rel.count AS count
+    """
+    for depth in (1, 2, 3)
+}
+
+
+# Chain and narrator styling for export_hadith_chain
+CHAIN_COLORS = ("#ff6b6b", "#4ecdc4", "#45b7d1", "#96ceb4", "#ffeaa7", "#dfe6e9")
+COMPANION_ROLE, COMPANION_COLOR = "صحابي", "#f39c12"  # Gold for companion
+FINAL_ROLE, FINAL_COLOR = "الراوي الأخير", "#9b59b6"  # Purple for final narrator
+MIDDLE_COLOR = "#3498db"  # Blue for middle narrators
+MIDDLE_ROLES = tuple(f"راوي [{i}]" for i in range(256))
+
+
+# vis-network options: hierarchical top-down layout for a hadith's chains
+HADITH_CHAIN_OPTIONS = {
+    "nodes": {"font": {"size": 14, "face": "Arial"}},
+    "edges": {
+        "arrows": {"to": {"enabled": True, "scaleFactor": 0.5}},
+        "smooth": {"type": "cubicBezier", "forceDirection": "vertical"},
+    },
+    "interaction": {"hideEdgesOnDrag": True, "tooltipDelay": 200},
+    "physics": {
+        "hierarchicalRepulsion": {
+            "centralGravity": 0.0,
+            "springLength": 150,
+            "springConstant": 0.01,
+            "nodeDistance": 200,
+        },
+        "solver": "hierarchicalRepulsion",
+        "stabilization": {"enabled": True, "iterations": 200, "fit": True},
+        "adaptiveTimestep": True,
+    },
+    "layout": {
+        "improvedLayout": False,
+        "hierarchical": {
+            "enabled": True,
+            "direction": "UD",
+            "sortMethod": "directed",
+            "levelSeparation": 150,
+            "nodeSpacing": 200,
+        },
+    },
+}
+
+# ... and a force-directed layout for a narrator's network
+NARRATOR_NETWORK_OPTIONS = {
+    "nodes": {"font": {"size": 12}},
+    "interaction": {"hideEdgesOnDrag": True, "tooltipDelay": 200},
+    "physics": {
+        "forceAtlas2Based": {
+            "gravitationalConstant": -50,
+            "centralGravity": 0.01,
+            "springLength": 200,
+        },
+        "solver": "forceAtlas2Based",
+        "stabilization": {"enabled": True, "iterations": 200, "fit": True},
+        "adaptiveTimestep": True,
+    },
+    "layout": {"improvedLayout": False},
+}
+
+
+# Hadith text plus every chain position; OPTIONAL MATCH keeps hadiths without chains
+HADITH_CHAIN_QUERY = """
+    MATCH (h:Hadith {source: $source, hadith_index: $idx})
+    OPTIONAL MATCH (h)-[:HAS_CHAIN]->(c:Chain)-[p:POSITION]->(n:Narrator)
+    RETURN h.text AS text, c.chain_id AS chain_id, c.length AS chain_length,
+           p.pos AS pos, n.name AS narrator, n.norm AS norm
+    ORDER BY chain_id, pos
+"""
+
+# Same rows for many hadiths at once
+HADITH_CHAINS_BATCH_QUERY = """
+    UNWIND $ids AS idx
+    MATCH (h:Hadith {source: $source, hadith_index: idx})
+    OPTIONAL MATCH (h)-[:HAS_CHAIN]->(c:Chain)-[p:POSITION]->(n:Narrator)
+    RETURN idx AS hadith_index, h.text AS text, c.chain_id AS chain_id,
+           c.length AS chain_length, p.pos AS pos, n.name AS narrator, n.norm AS norm
+    ORDER BY hadith_index, chain_id, pos
+"""
+
+
+# One driver (and connection pool) per server/credentials for the whole
+# process, so repeated exports skip the connect and auth handshake.
+# Drivers are closed at interpreter exit.
+_DRIVERS: Dict[tuple, Any] = {}
+_DRIVERS_LOCK = threading.Lock()
+
+
+def _shared_driver(uri: str, user: str, password: str):
+    key = (uri, user, password)
+    with _DRIVERS_LOCK:
+        driver = _DRIVERS.get(key)
+        if driver is None:
+            driver = GraphDatabase.driver(uri, auth=(user, password))
+            driver.verify_connectivity()
+            _DRIVERS[key] = driver
+        return driver
+
+
+@atexit.register
+def _close_drivers() -> None:
+    with _DRIVERS_LOCK:
+        for driver in _DRIVERS.values():
+            driver.close()
+        _DRIVERS.clear()
+
+
 class HadithGraphExporter:
     """Export hadith chains to interactive HTML visualizations."""
 
@@ -31,12 +265,11 @@ class HadithGraphExporter:
         self.driver = None
 
     def connect(self):
-        self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-        self.driver.verify_connectivity()
+        self.driver = _shared_driver(self.uri, self.user, self.password)
 
     def close(self):
-        if self.driver:
-            self.driver.close()
+        # The shared driver stays open for later exporters; see _close_drivers
+        self.driver = None
 
     def __enter__(self):
         self.connect()
@@ -64,199 +297,150 @@ class HadithGraphExporter:
         Returns:
             Path to the generated HTML file
         """
-        if output_file is None:
-            output_file = f"hadith_{hadith_index}_chain.html"
+        # Hadith text and all chain positions in one round-trip
+        with self.driver.session() as session:
+            records = session.execute_read(
+                lambda tx: list(tx.run(HADITH_CHAIN_QUERY, source=source, idx=hadith_index))
+            )
 
-        # Create network with settings for Arabic text
-        net = Network(
-            height="700px",
-            width="100%",
-            bgcolor="#ffffff",
-            font_color="#333333",
-            directed=True,
-            notebook=False
-        )
-
-        # Physics settings for better layout
-        net.set_options("""
-        {
-            "nodes": {
-                "font": {
-                    "size": 14,
-                    "face": "Arial"
-                }
-            },
-            "edges": {
-                "arrows": {
-                    "to": {
-                        "enabled": true,
-                        "scaleFactor": 0.5
-                    }
-                },
-                "smooth": {
-                    "type": "cubicBezier",
-                    "forceDirection": "vertical"
-                }
-            },
-            "physics": {
-                "hierarchicalRepulsion": {
-                    "centralGravity": 0.0,
-                    "springLength": 150,
-                    "springConstant": 0.01,
-                    "nodeDistance": 200
-                },
-                "solver": "hierarchicalRepulsion"
-            },
-            "layout": {
-                "hierarchical": {
-                    "enabled": true,
-                    "direction": "UD",
-                    "sortMethod": "directed",
-                    "levelSeparation": 150,
-                    "nodeSpacing": 200
-                }
-            }
-        }
-        """)
+        return self._render_hadith_chain(hadith_index, records, output_file)
+
+    def export_hadith_chains(
+        self,
+        hadith_indices: List[int],
+        source: str = "bukhari"
+    ) -> List[str]:
+        """
+        Export several hadiths' chains, fetching all of them in one query.
+
+        Args:
+            hadith_indices: The hadith numbers
+            source: Source collection (e.g., 'bukhari')
 
+        Returns:
+            Paths to the generated HTML files, in input order
+        """
         with self.driver.session() as session:
-            # Get hadith info
-            result = session.run("""
-                MATCH (h:Hadith {source: $source, hadith_index: $idx})
-                RETURN h.text AS text
-            """, source=source, idx=hadith_index)
-            record = result.single()
-            hadith_text = record["text"][:100] + "..." if record and record["text"] else ""
-
-            # Add hadith node
-            net.add_node(
-                f"hadith_{hadith_index}",
-                label=f"الحديث {hadith_index}",
-                title=hadith_text,
-                color="#4ecdc4",
-                size=30,
-                shape="box",
-                level=0
+            records = session.execute_read(
+                lambda tx: list(tx.run(HADITH_CHAINS_BATCH_QUERY, source=source, ids=list(hadith_indices)))
             )
 
-            # Get chains and positions
-            result = session.run("""
-                MATCH (h:Hadith {source: $source, hadith_index: $idx})-[:HAS_CHAIN]->(c:Chain)
-                MATCH (c)-[p:POSITION]->(n:Narrator)
-                RETURN c.chain_id AS chain_id, c.length AS chain_length,
-                       p.pos AS pos, n.name AS narrator, n.norm AS norm
-                ORDER BY chain_id, pos
-            """, source=source, idx=hadith_index)
-
-            chains_data: Dict[int, List[Dict]] = {}
-            for record in result:
-                chain_id = record["chain_id"]
-                if chain_id not in chains_data:
-                    chains_data[chain_id] = []
-                chains_data[chain_id].append({
-                    "pos": record["pos"],
-                    "name": record["narrator"],
-                    "norm": record["norm"],
-                    "length": record["chain_length"]
-                })
+        records_by_hadith: Dict[int, List[Any]] = {}
+        for record in records:
+            records_by_hadith.setdefault(record["hadith_index"], []).append(record)
 
-            # Color palette for chains
-            chain_colors = ["#ff6b6b", "#4ecdc4", "#45b7d1", "#96ceb4", "#ffeaa7", "#dfe6e9"]
-
-            # Add chain nodes and narrator nodes
-            narrator_nodes = set()
-
-            for chain_id, narrators in chains_data.items():
-                chain_color = chain_colors[(chain_id - 1) % len(chain_colors)]
-
-                # Add chain node
-                chain_node_id = f"chain_{hadith_index}_{chain_id}"
-                net.add_node(
-                    chain_node_id,
-                    label=f"السلسلة {chain_id}",
-                    title=f"عدد الرواة: {len(narrators)}",
-                    color=chain_color,
-                    size=20,
-                    shape="diamond",
-                    level=1
-                )
-
-                # Connect hadith to chain
-                net.add_edge(
-                    f"hadith_{hadith_index}",
-                    chain_node_id,
-                    color="#999999",
-                    width=2
-                )
-
-                # Sort narrators by position
-                narrators = sorted(narrators, key=lambda x: x["pos"])
-
-                # Add narrator nodes
-                prev_node_id = chain_node_id
-                for i, narrator in enumerate(narrators):
-                    node_id = f"narrator_{narrator['norm']}_{chain_id}"
-
-                    # Determine role
-                    if i == 0:
-                        role = "صحابي"
-                        node_color = "#f39c12"  # Gold for companion
-                    elif i == len(narrators) - 1:
-                        role = "الراوي الأخير"
-                        node_color = "#9b59b6"  # Purple for final narrator
-                    else:
-                        role = f"راوي [{i}]"
-                        node_color = "#3498db"  # Blue for middle narrators
-
-                    # Add node if not exists
-                    if node_id not in narrator_nodes:
-                        net.add_node(
-                            node_id,
-                            label=narrator["name"],
-                            title=f"{role}\nالموقع: {narrator['pos']}",
-                            color=node_color,
-                            size=15,
-                            level=i + 2
-                        )
-                        narrator_nodes.add(node_id)
-
-                    # Add edge from previous node
-                    net.add_edge(
-                        prev_node_id,
-                        node_id,
-                        color=chain_color,
-                        width=2,
-                        title=f"الموقع {narrator['pos']}"
-                    )
-
-                    prev_node_id = node_id
+        return [
+            self._render_hadith_chain(idx, records_by_hadith.get(idx, []))
+            for idx in hadith_indices
+        ]
 
-        # Generate HTML
-        net.save_graph(output_file)
+    def _render_hadith_chain(
+        self,
+        hadith_index: int,
+        records: List[Any],
+        output_file: str = None
+    ) -> str:
+        """
+        Render one hadith's chain rows (ordered by chain_id, pos) to HTML.
 
-        # Add RTL support to the HTML file
-        self._add_rtl_support(output_file)
+        Rows come from HADITH_CHAIN_QUERY; a hadith without chains yields a
+        single row whose chain columns are null.
+        """
+        if output_file is None:
+            output_file = f"hadith_{hadith_index}_chain.html"
 
-        print(f"✅ تم التصدير إلى: {output_file}")
-        return output_file
+        first = records[0] if records else None
+        hadith_text = first["text"][:100] + "..." if first and first["text"] else ""
+
+        # Nodes and edges are collected as dicts and added to the network in bulk
+        nodes: List[Dict[str, Any]] = [{
+            "id": f"hadith_{hadith_index}",
+            "label": f"الحديث {hadith_index}",
+            "title": hadith_text,
+            "color": "#4ecdc4",
+            "size": 30,
+            "shape": "box",
+            "level": 0
+        }]
+        edges: List[Dict[str, Any]] = []
+
+        # Add chain nodes and narrator nodes
+        narrator_nodes = set()
+
+        # Rows are ordered by chain_id, pos: group them in one pass, no re-sort
+        chain_rows = (record for record in records if record["chain_id"] is not None)
+        for chain_id, rows in groupby(chain_rows, key=itemgetter("chain_id")):
+            narrators = [
+                {"pos": row["pos"], "name": row["narrator"], "norm": row["norm"]}
+                for row in rows
+            ]
+            chain_color = CHAIN_COLORS[(chain_id - 1) % len(CHAIN_COLORS)]
+
+            # Add chain node
+            chain_node_id = f"chain_{hadith_index}_{chain_id}"
+            nodes.append({
+                "id": chain_node_id,
+                "label": f"السلسلة {chain_id}",
+                "title": f"عدد الرواة: {len(narrators)}",
+                "color": chain_color,
+                "size": 20,
+                "shape": "diamond",
+                "level": 1
+            })
+
+            # Connect hadith to chain
+            edges.append({
+                "from": f"hadith_{hadith_index}",
+                "to": chain_node_id,
+                "color": "#999999",
+                "width": 2
+            })
+
+            # Add narrator nodes
+            prev_node_id = chain_node_id
+            last = len(narrators) - 1
+            for i, narrator in enumerate(narrators):
+                node_id = f"narrator_{narrator['norm']}_{chain_id}"
+
+                # Determine role
+                if i == 0:
+                    role, node_color = COMPANION_ROLE, COMPANION_COLOR
+                elif i == last:
+                    role, node_color = FINAL_ROLE, FINAL_COLOR
+                else:
+                    role = MIDDLE_ROLES[i] if i < len(MIDDLE_ROLES) else f"راوي [{i}]"
+                    node_color = MIDDLE_COLOR
+
+                # Add node if not exists
+                if node_id not in narrator_nodes:
+                    nodes.append({
+                        "id": node_id,
+                        "label": narrator["name"],
+                        "title": f"{role}\nالموقع: {narrator['pos']}",
+                        "color": node_color,
+                        "size": 15,
+                        "level": i + 2
+                    })
+                    narrator_nodes.add(node_id)
+
+                # Add edge from previous node
+                edges.append({
+                    "from": prev_node_id,
+                    "to": node_id,
+                    "color": chain_color,
+                    "width": 2,
+                    "title": f"الموقع {narrator['pos']}"
+                })
 
-    def _add_rtl_support(self, filepath: str):
-        """Add RTL CSS to the generated HTML."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        rtl_css = """
-        <style>
-            body { direction: rtl; font-family: 'Arial', sans-serif; }
-            .card { direction: rtl; }
-            h1, h2, h3, p { direction: rtl; text-align: right; }
-        </style>
-        """
+                prev_node_id = node_id
 
-        content = content.replace('</head>', f'{rtl_css}</head>')
+        _apply_defaults(nodes, edges)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Generate HTML
+        _save_html(output_file, f"الحديث {hadith_index}", nodes, edges, HADITH_CHAIN_OPTIONS)
+
+        print(f"✅ تم التصدير إلى: {output_file}")
+        return output_file
 
     def export_narrator_network(
         self,
@@ -277,33 +461,11 @@ class HadithGraphExporter:
         Returns:
             Path to the generated HTML file
         """
+        depth = max(1, min(depth, max(NARRATOR_NETWORK_QUERIES)))
         if output_file is None:
             safe_name = narrator_name.replace(" ", "_")[:20]
             output_file = f"narrator_{safe_name}_network.html"
 
-        net = Network(
-            height="700px",
-            width="100%",
-            bgcolor="#ffffff",
-            font_color="#333333",
-            directed=True
-        )
-
-        net.set_options("""
-        {
-            "nodes": {
-                "font": {"size": 12}
-            },
-            "physics": {
-                "forceAtlas2Based": {
-                    "gravitationalConstant": -50,
-                    "centralGravity": 0.01,
-                    "springLength": 200
-                },
-                "solver": "forceAtlas2Based"
-            }
-        }
-        """)
 
         with self.driver.session() as session:
             # Find the narrator
@@ -323,52 +485,48 @@ class HadithGraphExporter:
             center_norm = record["norm"]
 
             # Get network
-            result = session.run(f"""
-                MATCH (center:Narrator {{source: $source, norm: $norm}})
-                MATCH path = (center)-[:TRANSMITTED_TO*1..{depth}]-(other:Narrator)
-                WITH center, other,
-                     [r in relationships(path) | r] AS rels
-                UNWIND rels AS rel
-                RETURN DISTINCT
-                    startNode(rel).name AS from_name,
-                    startNode(rel).norm AS from_norm,
-                    endNode(rel).name AS to_name,
-                    endNode(rel).norm AS to_norm,
-                    rel.count AS count
-            """, source=source, norm=center_norm)
-
-            nodes_added = set()
+            result = session.run(
+                NARRATOR_NETWORK_QUERIES[depth], source=source, norm=center_norm
+            )
+
+            # The center node is added up front, so the loop only has to do a
+            # set lookup per endpoint (no per-node comparison with center_norm)
+            nodes_added = {center_norm}
+            nodes: List[Dict[str, Any]] = [
+                {"id": center_norm, "label": center_name, "color": "#ff6b6b", "size": 25}
+            ]
+            edges: List[Dict[str, Any]] = []
 
             for record in result:
-                from_name = record["from_name"]
                 from_norm = record["from_norm"]
-                to_name = record["to_name"]
                 to_norm = record["to_norm"]
                 count = record["count"] or 1
 
                 # Add nodes
                 if from_norm not in nodes_added:
-                    color = "#ff6b6b" if from_norm == center_norm else "#4ecdc4"
-                    size = 25 if from_norm == center_norm else 15
-                    net.add_node(from_norm, label=from_name, color=color, size=size)
+                    nodes.append({"id": from_norm, "label": record["from_name"], "color": "#4ecdc4", "size": 15})
                     nodes_added.add(from_norm)
 
                 if to_norm not in nodes_added:
-                    color = "#ff6b6b" if to_norm == center_norm else "#4ecdc4"
-                    size = 25 if to_norm == center_norm else 15
-                    net.add_node(to_norm, label=to_name, color=color, size=size)
+                    nodes.append({"id": to_norm, "label": record["to_name"], "color": "#4ecdc4", "size": 15})
                     nodes_added.add(to_norm)
 
                 # Add edge
-                net.add_edge(
-                    from_norm,
-                    to_norm,
-                    value=count,
-                    title=f"{count} أحاديث مشتركة"
-                )
+                edges.append({
+                    "from": from_norm,
+                    "to": to_norm,
+                    "value": count,
+                    "title": f"{count} أحاديث مشتركة"
+                })
+
+        # Multi-hop networks get too large to lay out in the browser:
+        # compute positions once here and freeze them
+        options = NARRATOR_NETWORK_OPTIONS
+        if depth >= 2 and nodes:
+            options = _freeze_layout(options, nodes, edges)
 
-        net.save_graph(output_file)
-        self._add_rtl_support(output_file)
+        _apply_defaults(nodes, edges)
+        _save_html(output_file, center_name, nodes, edges, options)
 
         print(f"✅ تم تصدير شبكة {center_name} إلى: {output_file}")
         return output_file
@@ -395,10 +553,12 @@ def main():
                 if choice == "0":
                     break
                 elif choice == "1":
-                    idx = input("رقم الحديث: ").strip()
-                    if idx.isdigit():
-                        output = exporter.export_hadith_chain(int(idx))
-                        print(f"\n🌐 افتح الملف في المتصفح: {output}\n")
+                    # Several space-separated numbers are fetched in one query
+                    indices = input("رقم الحديث: ").split()
+                    if indices and all(idx.isdigit() for idx in indices):
+                        outputs = exporter.export_hadith_chains([int(idx) for idx in indices])
+                        for output in outputs:
+                            print(f"\n🌐 افتح الملف في المتصفح: {output}\n")
                 elif choice == "2":
                     name = input("اسم الراوي: ").strip()
                     if name:
@@ -415,9 +575,9 @@ def main():
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
-        # Quick export mode
-        hadith_idx = int(sys.argv[1])
+        # Quick export mode: one or more hadith numbers, fetched in one query
+        hadith_indices = [int(arg) for arg in sys.argv[1:]]
         with HadithGraphExporter() as exporter:
-            exporter.export_hadith_chain(hadith_idx)
+            exporter.export_hadith_chains(hadith_indices)
     else:
         main()
@@ -1,5 +1,14 @@
-import json
-from typing import List, Dict, Any
+import argparse
+from multiprocessing import Pool
+from typing import List, Dict, Any, Iterable, Optional
+
+import json_utils
+
+# Hadiths per process-pool task; smaller inputs are extracted in-process
+PARALLEL_CHUNK_SIZE = 2048
+
+# Shared read-only default for narrators without attributes
+_EMPTY: Dict[str, Any] = {}
 
 
 def extract_narrator_chains(hadith: Dict[str, Any]) -> List[List[str]]:
@@ -18,7 +27,7 @@ def extract_narrator_chains(hadith: Dict[str, Any]) -> List[List[str]]:
     # Find positions of "lead" narrators
     lead_indices = [
         i for i, narrator in enumerate(narrators)
-        if narrator.get("attributes", {}).get("role") == "lead"
+        if (narrator.get("attributes") or _EMPTY).get("role") == "lead"
     ]
 
     if not lead_indices:
@@ -46,105 +55,190 @@ def extract_narrator_chains(hadith: Dict[str, Any]) -> List[List[str]]:
     return chains
 
 
-def process_all_hadiths(input_file: str, output_file: str = None):
+def _dump_indented(obj: Any, level: int) -> bytes:
+    """Serialize obj with 2-space indentation, shifted right by `level` steps."""
+    return json_utils.dumps_bytes(obj, indent=True).replace(b"\n", b"\n" + b"  " * level)
+
+
+def _write_array(f, items: Iterable[Any], level: int = 0) -> None:
+    """
+    Write items as an indented JSON array, one element at a time.
+
+    Produces the same bytes as dumping the whole list with indent=2, without
+    holding the serialized document in memory.
+    """
+    pad = b"  " * (level + 1)
+    first = True
+    for item in items:
+        f.write((b"[\n" if first else b",\n") + pad + _dump_indented(item, level + 1))
+        first = False
+    f.write(b"[]" if first else b"\n" + b"  " * level + b"]")
+
+
+def extract_all_narrator_chains(hadiths: List[Dict[str, Any]]) -> List[List[List[str]]]:
+    """
+    Extract narrator chains for every hadith.
+
+    Args:
+        hadiths: List of hadith dictionaries
+
+    Returns:
+        One list of chains per hadith, in input order
+    """
+    return [extract_narrator_chains(hadith) for hadith in hadiths]
+
+
+def extract_chains_parallel(
+    hadiths: List[Dict[str, Any]],
+    processes: Optional[int] = None
+) -> List[List[List[str]]]:
+    """
+    Run extract_all_narrator_chains, optionally over chunks in a process pool.
+
+    The pool is opt-in: shipping hadiths to workers and chains back costs a
+    large fraction of the serial extraction itself, so it only pays off
+    with several real cores. Chunks are returned in order (Pool.imap), so
+    the result lines up with the input. Inputs of at most one chunk are
+    always handled in-process.
+
+    Args:
+        hadiths: List of hadith dictionaries
+        processes: Worker count; None or 1 extracts serially in-process
+
+    Returns:
+        One list of chains per hadith, in input order
+    """
+    if not processes or processes <= 1 or len(hadiths) <= PARALLEL_CHUNK_SIZE:
+        return extract_all_narrator_chains(hadiths)
+
+    chunks = [
+        hadiths[i:i + PARALLEL_CHUNK_SIZE]
+        for i in range(0, len(hadiths), PARALLEL_CHUNK_SIZE)
+    ]
+    all_chains: List[List[List[str]]] = []
+    with Pool(min(processes, len(chunks))) as pool:
+        for chains in pool.imap(extract_all_narrator_chains, chunks):
+            all_chains.extend(chains)
+    return all_chains
+
+
+def process_all_hadiths(
+    input_file: str,
+    output_file: str = None,
+    hadiths: Optional[List[Dict[str, Any]]] = None,
+    precomputed_chains: Optional[List[List[List[str]]]] = None
+):
     """
     Process all hadiths and extract narrator chains.
 
     Args:
         input_file: Path to input JSON file
         output_file: Path to output JSON file (optional)
+        hadiths: Already-loaded hadiths (input_file is not read when given)
+        precomputed_chains: Chains per hadith from extract_chains_parallel
     """
     # Read the file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        hadiths = json.load(f)
+    if hadiths is None:
+        hadiths = json_utils.load_file(input_file)
+    if precomputed_chains is None:
+        precomputed_chains = extract_all_narrator_chains(hadiths)
 
     results = []
+    f = open(output_file, 'wb') if output_file else None
+
+    try:
+        for hadith, chains in zip(hadiths, precomputed_chains):
+            hadith_index = hadith.get("hadith_index")
+
+            result = {
+                "hadith_index": hadith_index,
+                "chains": [
+                    {
+                        "chain_number": i + 1,
+                        "narrators": chain,
+                        "chain_formatted": " -> ".join(chain)
+                    }
+                    for i, chain in enumerate(chains)
+                ]
+            }
+            results.append(result)
+
+            # Print result for display
+            print(f"\n=== Hadith {hadith_index} ===")
+            for i, chain_data in enumerate(result["chains"], 1):
+                print(f"{i}. {chain_data['chain_formatted']}")
+
+            # Save each record as it is built if output file is specified
+            if f is not None:
+                f.write((b",\n  " if len(results) > 1 else b"[\n  ") + _dump_indented(result, 1))
+        if f is not None:
+            f.write(b"\n]" if results else b"[]")
+    finally:
+        if f is not None:
+            f.close()
 
-    for hadith in hadiths:
-        hadith_index = hadith.get("hadith_index")
-        chains = extract_narrator_chains(hadith)
-
-        result = {
-            "hadith_index": hadith_index,
-            "chains": [
-                {
-                    "chain_number": i + 1,
-                    "narrators": chain,
-                    "chain_formatted": " -> ".join(chain)
-                }
-                for i, chain in enumerate(chains)
-            ]
-        }
-        results.append(result)
-
-        # Print result for display
-        print(f"\n=== Hadith {hadith_index} ===")
-        for i, chain_data in enumerate(result["chains"], 1):
-            print(f"{i}. {chain_data['chain_formatted']}")
-
-    # Save results if output file is specified
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
         print(f"\n✓ Results saved to: {output_file}")
 
     return results
 
 
-def create_knowledge_graph_data(input_file: str, output_file: str = None):
+def create_knowledge_graph_data(
+    input_file: str,
+    output_file: str = None,
+    hadiths: Optional[List[Dict[str, Any]]] = None,
+    precomputed_chains: Optional[List[List[List[str]]]] = None
+):
     """
     Create data ready for building a knowledge graph.
 
     Args:
         input_file: Path to input JSON file
         output_file: Path to output JSON file for graph data
+        hadiths: Already-loaded hadiths (input_file is not read when given)
+        precomputed_chains: Chains per hadith from extract_chains_parallel
     """
-    with open(input_file, 'r', encoding='utf-8') as f:
-        hadiths = json.load(f)
+    if hadiths is None:
+        hadiths = json_utils.load_file(input_file)
+    if precomputed_chains is None:
+        precomputed_chains = extract_all_narrator_chains(hadiths)
 
-    nodes_dict = {}  # Narrator name -> role (to track if they're ever a lead)
+    names = set()    # Every narrator seen in any chain
+    leads = set()    # Narrators that end at least one chain (الراوي الأعظم)
     edges = []       # Relationships between narrators
+    add_edges = edges.extend
 
-    for hadith in hadiths:
+    for hadith, chains in zip(hadiths, precomputed_chains):
         hadith_index = hadith.get("hadith_index")
-        narrators_data = hadith.get("narrators", [])
-        chains = extract_narrator_chains(hadith)
 
         for chain_num, chain in enumerate(chains, 1):
-            # Add narrators as nodes and identify lead narrators
-            for i, narrator in enumerate(chain):
-                is_last = (i == len(chain) - 1)
-
-                # If this is the last narrator in the chain, they are a lead narrator
-                if narrator not in nodes_dict:
-                    nodes_dict[narrator] = "lead" if is_last else "narrator"
-                elif is_last:
-                    # If we've seen this narrator before but now they're a lead, upgrade them
-                    nodes_dict[narrator] = "lead"
-
-            # Add relationships as edges
-            for i in range(len(chain) - 1):
-                edge = {
-                    "from": chain[i],
-                    "to": chain[i + 1],
+            names.update(chain)
+            # Add relationships as edges, pairing each narrator with the next
+            add_edges(
+                {
+                    "from": from_name,
+                    "to": to_name,
                     "hadith_index": hadith_index,
                     "chain_number": chain_num,
-                    "position": i + 1
+                    "position": position
                 }
-                edges.append(edge)
+                for position, (from_name, to_name) in enumerate(zip(chain, chain[1:]), 1)
+            )
+        # The last narrator of a chain is a lead, even if seen elsewhere mid-chain
+        leads.update(chain[-1] for chain in chains if chain)
 
-    # Convert nodes_dict to list with role information
+    # Node list with role information
     nodes = [
         {
             "id": name,
             "label": name,
-            "role": role
+            "role": "lead" if name in leads else "narrator"
         }
-        for name, role in sorted(nodes_dict.items())
+        for name in sorted(names)
     ]
 
     # Count lead narrators vs regular narrators
-    lead_count = sum(1 for n in nodes if n["role"] == "lead")
+    lead_count = len(leads)
     regular_count = len(nodes) - lead_count
 
     graph_data = {
@@ -159,8 +253,12 @@ def create_knowledge_graph_data(input_file: str, output_file: str = None):
     }
 
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_data, f, ensure_ascii=False, indent=2)
+        # Same layout as one indented dump, but the (large) edges array is
+        # serialized one edge at a time
+        with open(output_file, 'wb') as f:
+            f.write(b'{\n  "nodes": ' + _dump_indented(nodes, 1) + b',\n  "edges": ')
+            _write_array(f, edges, level=1)
+            f.write(b',\n  "stats": ' + _dump_indented(graph_data["stats"], 1) + b"\n}")
         print(f"\n✓ Knowledge Graph data saved to: {output_file}")
         print(f"  - Total narrators: {graph_data['stats']['total_narrators']}")
         print(f"  - Lead narrators (الراوي الأعظم): {graph_data['stats']['lead_narrators']}")
@@ -171,15 +269,26 @@ def create_knowledge_graph_data(input_file: str, output_file: str = None):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract narrator chains and knowledge graph data")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Extract chains in a process pool of this many workers (default: serial)")
+    args = parser.parse_args()
+
     # Example usage
     file_name = "Sahih Muslime Without_Tashkel_results"
     input_file = f"data/{file_name}.json"
 
+    # Load and extract once; both outputs are built from the same chains
+    hadiths = json_utils.load_file(input_file)
+    all_chains = extract_chains_parallel(hadiths, args.processes)
+
     # Extract chains
     print("Extracting narrator chains...")
     chains_output = process_all_hadiths(
         input_file,
-        output_file=f"data/{file_name}_narrator_chains.json"
+        output_file=f"data/{file_name}_narrator_chains.json",
+        hadiths=hadiths,
+        precomputed_chains=all_chains
     )
 
     # Create Knowledge Graph data
@@ -187,5 +296,7 @@ if __name__ == "__main__":
     print("Creating Knowledge Graph data...")
     graph_data = create_knowledge_graph_data(
         input_file,
-        output_file=f"data/{file_name}_narrator_graph.json"
+        output_file=f"data/{file_name}_narrator_graph.json",
+        hadiths=hadiths,
+        precomputed_chains=all_chains
     )
@@ -13,6 +13,11 @@ Routing:
     2) router decides complex=True
   - Otherwise uses Light model first, fallback to Strong.
 
+Batch mode (USE_BATCH_API=1):
+  - Submits the extractions through the OpenAI Batch API instead, routing by
+    length only (no router call); failed light results are retried in a
+    second batch on the Strong model.
+
 Output:
   [
     {
@@ -41,15 +46,26 @@ Output:
 
 import os
 import re
+import sys
 import json
 import csv
+import time
+import asyncio
 import textwrap
-from typing import List, Literal, Dict, Any, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import List, Literal, Dict, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
+from openai import OpenAI
+
+# Add parent directory to path to import the shared JSON helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_utils
+
 
 load_dotenv("../.env")
 
@@ -77,6 +93,16 @@ OUT_JSON_PATH = os.getenv(
 MAX_HADITHS = int(os.getenv("MAX_HADITHS", "5"))  # 0 => all hadiths
 RESUME = os.getenv("RESUME", "0").strip().lower() not in ("0", "false", "no")
 
+# Hadiths in flight at once; keep within the account's OpenAI rate limits
+CONCURRENCY = int(os.getenv("CONCURRENCY", "16"))
+# Finished hadiths are flushed to the checkpoint this many at a time
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY", "25"))
+
+# Batch mode: submit all extractions through the OpenAI Batch API (half the
+# token price, 24h completion window) instead of one request at a time.
+USE_BATCH_API = os.getenv("USE_BATCH_API", "0").strip().lower() not in ("0", "false", "no")
+BATCH_POLL_SECONDS = int(os.getenv("BATCH_POLL_SECONDS", "60"))
+
 # Single hadith test mode:
 # Put any hadith text here to test just one hadith and skip CSV loading.
 test_hadith = "حدثنا عبد الله بن يوسف أخبرنا مالك عن سمي مولى أبي بكر بن عبد الرحمن عن أبي صالح السمان عن أبي هريرة رضي الله عنه أن رسول الله صلى الله عليه وسلم قال العمرة إلى العمرة كفارة لما بينهما والحج المبرور ليس له جزاء إلا الجنة.  " # bukhari hadith
@@ -155,81 +181,77 @@ def get_book_hints(book: str) -> Dict[str, Any]:
 # =========================
 # Helpers
 # =========================
+# Leaked performance prefixes (حدثنا/أخبرنا/etc.) in case the LLM includes them.
+# Each may be stacked on the ones before it ("حدثنا عن ..."), so the fused
+# pattern is a run of optional groups in this order.
+_PREFIXES = ["حدثنا", "أخبرنا", "حدثني", "أخبرني", "سمعت", "عن", "قال"]
+_PREFIX_RE = re.compile("^" + "".join(rf"(?:{p}\s+)?" for p in _PREFIXES))
+
+# Honorifics and titles: the name is cut at the first one found
+_HONORIFICS = [
+    "رضي الله عنه",
+    "رضي الله عنها",
+    "رضي الله عنهم",
+    "رضي الله عنهما",
+    "صلى الله عليه وسلم",
+    "عليه السلام",
+    "رحمه الله",
+    "رحمها الله",
+    "أم المؤمنين",
+    "الصحابي",
+    "التابعي",
+]
+_HONORIFIC_RE = re.compile(r"\s+(?:" + "|".join(_HONORIFICS) + ").*", re.IGNORECASE)
+
 def normalize_whitespace(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    # str.split() splits on exactly the characters regex \s matches
+    return " ".join((s or "").split())
 
 
+# The same raw names recur across hadiths, so cleaned names are memoized
+@lru_cache(maxsize=200_000)
 def clean_narrator_name(name: str) -> str:
     """Remove honorifics, titles, and leaked performance prefixes from narrator names."""
     name = normalize_whitespace(name)
 
-    # Remove leaked performance prefixes (حدثنا/أخبرنا/etc.) in case the LLM includes them
-    prefixes = [
-        r"^حدثنا\s+",
-        r"^أخبرنا\s+",
-        r"^حدثني\s+",
-        r"^أخبرني\s+",
-        r"^سمعت\s+",
-        r"^عن\s+",
-        r"^قال\s+",
-    ]
-    for pattern in prefixes:
-        name = re.sub(pattern, "", name)
-
-    # Remove honorifics and titles
-    honorifics = [
-        r"\s+رضي الله عنه.*",
-        r"\s+رضي الله عنها.*",
-        r"\s+رضي الله عنهم.*",
-        r"\s+رضي الله عنهما.*",
-        r"\s+صلى الله عليه وسلم.*",
-        r"\s+عليه السلام.*",
-        r"\s+رحمه الله.*",
-        r"\s+رحمها الله.*",
-        r"\s+أم المؤمنين.*",
-        r"\s+الصحابي.*",
-        r"\s+التابعي.*",
-    ]
-
-    for pattern in honorifics:
-        name = re.sub(pattern, "", name, flags=re.IGNORECASE)
+    # Remove leaked performance prefixes, then honorifics and titles
+    name = _PREFIX_RE.sub("", name, count=1)
+    name = _HONORIFIC_RE.sub("", name, count=1)
 
     return normalize_whitespace(name)
 
 
+# The Prophet must never appear as a narrator; one search covers all markers
+_PROPHET_MARKERS = ["رسول الله", "النبي", "محمد صلى الله عليه وسلم", "رسولِ الله"]
+_PROPHET_RE = re.compile("|".join(map(re.escape, _PROPHET_MARKERS)))
+
+_NON_ARABIC_RE = re.compile("[^\u0600-\u06FF]+")
+
+
 def is_arabic_heavy(text: str) -> bool:
-    return sum(1 for ch in text if "\u0600" <= ch <= "\u06FF") > 20
+    # Strip everything outside the Arabic block in one C-level pass and count the rest
+    return len(text) > 20 and len(_NON_ARABIC_RE.sub("", text)) > 20
 
 
 def renumber_chain_ids(chains: List[ChainItem]) -> List[ChainItem]:
-    """Ensure chain_id contiguous chain_1..chain_n."""
-    new = []
+    """Ensure chain_id contiguous chain_1..chain_n (in place; returns chains)."""
     for i, ch in enumerate(chains, 1):
         ch.chain_id = f"chain_{i}"
-        new.append(ch)
-    return new
+    return chains
 
 
 def basic_validate_extraction(
     _hadith_text: str, extraction: HadithExtraction
 ) -> Tuple[bool, str]:
     """
-    Lightweight sanity checks:
-    - chain_id format ok
+    Lightweight sanity checks (chain_ids are already renumbered by
+    renumber_chain_ids, so their format is not re-checked):
     - no empty names
     - last narrator in each chain should be lead
     - avoid Prophet name included as narrator
     - type field is valid
     """
-    prophet_markers = [
-        "رسول الله",
-        "النبي",
-        "محمد صلى الله عليه وسلم",
-        "رسولِ الله",
-    ]
     for ch in extraction.chains:
-        if not re.match(r"^chain_\d+$", ch.chain_id):
-            return False, f"chain_id غير صحيح: {ch.chain_id}"
         if ch.type not in ("primary", "follow_up", "nested"):
             return False, f"{ch.chain_id} نوع غير صحيح: {ch.type}"
         if not ch.narrators:
@@ -238,7 +260,7 @@ def basic_validate_extraction(
             name = normalize_whitespace(n.name)
             if not name:
                 return False, f"{ch.chain_id} فيه اسم فاضي"
-            if any(pm in name for pm in prophet_markers):
+            if _PROPHET_RE.search(name):
                 return (
                     False,
                     f"{ch.chain_id} يحتوي النبي ضمن الرواة (غير مسموح)",
@@ -253,6 +275,7 @@ def basic_validate_extraction(
 # =========================
 # Prompts
 # =========================
+@lru_cache(maxsize=None)
 def build_router_prompt(book: str) -> str:
     hints = get_book_hints(book)
     name_ar = hints["name_ar"]
@@ -281,15 +304,7 @@ def build_router_prompt(book: str) -> str:
 """.strip()
 
 
-def build_advanced_extractor_prompt(book: str) -> str:
-    """
-    Enhanced prompt for advanced isnad patterns:
-    ح separator, متابعات, coupling, chain completion.
-    """
-    hints = get_book_hints(book)
-    name_ar = hints["name_ar"]
-
-    return textwrap.dedent(f"""
+_ADV_PROMPT_TEMPLATE = textwrap.dedent("""
     أنت خبير في تحليل أسانيد الحديث العربي (كتاب: {name_ar}).
     مهمتك استخراج جميع الأسانيد/الطرق بدقة عالية وتحويلها إلى بيانات مهيكلة لبناء Knowledge Graph.
 
@@ -368,7 +383,16 @@ def build_advanced_extractor_prompt(book: str) -> str:
        - "nested": الأسانيد المدرجة في منتصف النص (قال فلان وأخبرني/وحدثني فلان أن فلان).
 
     أخرج JSON فقط دون أي شرح أو تعليق.
-    """).strip()
+    """)
+
+
+@lru_cache(maxsize=None)
+def build_advanced_extractor_prompt(book: str) -> str:
+    """
+    Enhanced prompt for advanced isnad patterns:
+    ح separator, متابعات, coupling, chain completion.
+    """
+    return _ADV_PROMPT_TEMPLATE.format(name_ar=get_book_hints(book)["name_ar"]).strip()
 
 
 # =========================
@@ -591,6 +615,32 @@ def few_shot_block() -> str:
     return "\n\n---\n\n".join(blocks)
 
 
+FEWSHOT_BLOCK = few_shot_block()
+
+
+# The prompts depend only on the book, so each book's full prefix is built once
+# here; requests then share an identical prefix (and OpenAI's prompt cache).
+# For extraction all static text (instructions + few-shots) is the system
+# message and the user message carries only the hadith.
+ROUTER_PROMPTS = {book: build_router_prompt(book) for book in BOOK_HINTS}
+EXTRACTOR_SYSTEM_PROMPT = "أنت مساعد لا يخرج إلا JSON مطابق للـ schema."
+EXTRACTOR_PROMPTS = {
+    book: (
+        EXTRACTOR_SYSTEM_PROMPT
+        + "\n\n"
+        + build_advanced_extractor_prompt(book)
+        + "\n\nأمثلة:\n"
+        + FEWSHOT_BLOCK
+    )
+    for book in BOOK_HINTS
+}
+EXTRACTOR_USER_PREFIX = "نص الحديث المطلوب:\n"
+
+
+def get_prompt(prompts: Dict[str, str], book: str) -> str:
+    return prompts.get(book) or prompts["generic"]
+
+
 # =========================
 # LLM Calls
 # =========================
@@ -603,16 +653,41 @@ class RunStats:
     strong_success: int = 0
     router_true: int = 0
     len_threshold_true: int = 0
+    markers_true: int = 0
+    markers_false: int = 0
 
 
+@lru_cache(maxsize=None)
 def make_llm(model: str, temperature: float = 0.0) -> ChatOpenAI:
+    # One client per model, so every request reuses its HTTP connection pool
     return ChatOpenAI(model=model, temperature=temperature, api_key=OPENAI_API_KEY)
 
 
-def route_is_complex(hadith_text: str, book: str, stats: RunStats) -> bool:
+# Explicit tahweel (ح) or follow-up markers: complex without asking the router
+_COMPLEX_MARKERS_RE = re.compile(r"(?:^|\s)\(?ح\)?(?=\s|$)|تابعه|ورواه|وفي رواية|خالفه")
+_PERF_VERB_RE = re.compile(r"حدثنا|أخبرنا|حدثني|أخبرني|سمعت")
+
+
+def route_by_markers(hadith_text: str) -> Optional[bool]:
+    """
+    Decide the clear-cut routing cases without a router call.
+
+    True when a tahweel/follow-up marker is present, False when there is at
+    most one performance verb (a single plain isnad), None otherwise. Plain
+    chains repeat حدثنا/أخبرنا at every link, so verb counts alone never
+    mark a hadith complex.
+    """
+    if _COMPLEX_MARKERS_RE.search(hadith_text):
+        return True
+    if len(_PERF_VERB_RE.findall(hadith_text)) <= 1:
+        return False
+    return None
+
+
+async def aroute_is_complex(hadith_text: str, book: str, stats: RunStats) -> bool:
     router_llm = make_llm(ROUTER_MODEL, TEMP).with_structured_output(RouteDecision)
-    prompt = build_router_prompt(book)
-    decision: RouteDecision = router_llm.invoke(
+    prompt = get_prompt(ROUTER_PROMPTS, book)
+    decision: RouteDecision = await router_llm.ainvoke(
         [
             ("system", "أنت مساعد دقيق وتلتزم بالمخرجات الهيكلية فقط."),
             ("user", prompt + "\n\nنص الحديث:\n" + hadith_text),
@@ -623,28 +698,23 @@ def route_is_complex(hadith_text: str, book: str, stats: RunStats) -> bool:
     return decision.complex
 
 
-def extract_with_model(
+async def aextract_with_model(
     hadith_text: str, book: str, model: str
 ) -> HadithExtraction:
     llm = make_llm(model, TEMP).with_structured_output(HadithExtraction)
 
-    prompt = build_advanced_extractor_prompt(book)
-    fewshots = few_shot_block()
-
-    user_msg = (
-        prompt
-        + "\n\nأمثلة:\n"
-        + fewshots
-        + "\n\n===\n\nنص الحديث المطلوب:\n"
-        + hadith_text
-    )
-
-    extraction: HadithExtraction = llm.invoke(
+    extraction: HadithExtraction = await llm.ainvoke(
         [
-            ("system", "أنت مساعد لا يخرج إلا JSON مطابق للـ schema."),
-            ("user", user_msg),
+            ("system", get_prompt(EXTRACTOR_PROMPTS, book)),
+            ("user", EXTRACTOR_USER_PREFIX + hadith_text),
         ]
     )
+    return finish_extraction(hadith_text, extraction)
+
+
+def finish_extraction(
+    hadith_text: str, extraction: HadithExtraction
+) -> HadithExtraction:
     # Renumber chain_ids defensively
     extraction.chains = renumber_chain_ids(extraction.chains)
     ok, reason = basic_validate_extraction(hadith_text, extraction)
@@ -658,6 +728,16 @@ def process_one_hadith(
     hadith_index: int,
     book: str,
     stats: RunStats,
+) -> Dict[str, Any]:
+    """Synchronous wrapper around aprocess_one_hadith (single hadith test mode)."""
+    return asyncio.run(aprocess_one_hadith(hadith_text, hadith_index, book, stats))
+
+
+async def aprocess_one_hadith(
+    hadith_text: str,
+    hadith_index: int,
+    book: str,
+    stats: RunStats,
 ) -> Dict[str, Any]:
     text = normalize_whitespace(hadith_text)
     stats.total += 1
@@ -668,8 +748,16 @@ def process_one_hadith(
         stats.len_threshold_true += 1
 
     complex_flag = False
+    by_markers = None
     if not force_strong:
-        complex_flag = route_is_complex(text, book, stats)
+        by_markers = route_by_markers(text)
+        if by_markers is None:
+            complex_flag = await aroute_is_complex(text, book, stats)
+        elif by_markers:
+            complex_flag = True
+            stats.markers_true += 1
+        else:
+            stats.markers_false += 1
         if complex_flag:
             force_strong = True
 
@@ -677,28 +765,104 @@ def process_one_hadith(
     if len(text) >= LEN_STRONG_THRESHOLD:
         route_reason = "length_threshold"
     elif complex_flag:
-        route_reason = "router_complex"
+        route_reason = "marker_complex" if by_markers else "router_complex"
     else:
         route_reason = "default_light"
 
     model_used = ""
     if force_strong:
         stats.routed_to_strong += 1
-        extraction = extract_with_model(text, book, STRONG_MODEL)
+        extraction = await aextract_with_model(text, book, STRONG_MODEL)
         stats.strong_success += 1
         model_used = STRONG_MODEL
     else:
         try:
-            extraction = extract_with_model(text, book, LIGHT_MODEL)
+            extraction = await aextract_with_model(text, book, LIGHT_MODEL)
             stats.light_success += 1
             model_used = LIGHT_MODEL
         except Exception:
             stats.used_fallback += 1
-            extraction = extract_with_model(text, book, STRONG_MODEL)
+            extraction = await aextract_with_model(text, book, STRONG_MODEL)
             stats.strong_success += 1
             model_used = STRONG_MODEL
             route_reason = "fallback"
 
+    return build_result_item(
+        hadith_text, hadith_index, model_used, route_reason, extraction
+    )
+
+
+async def aprocess_hadiths(
+    hadiths: Iterable[str],
+    start_index: int,
+    book: str,
+    stats: RunStats,
+    results: List[Dict[str, Any]],
+) -> None:
+    """
+    Process hadiths from start_index on, at most CONCURRENCY at a time.
+
+    Hadiths are pulled from the iterable only as slots free up, so a
+    streamed CSV is never held in memory whole. Items are appended to
+    `results` in hadith order once every earlier hadith is done and
+    flushed to the checkpoint every CHECKPOINT_EVERY items (and on any
+    exit, including errors), so the checkpoint is always a prefix RESUME
+    can continue from.
+    """
+
+    async def run_one(i: int, hadith_text: str) -> Tuple[int, Dict[str, Any]]:
+        try:
+            item = await aprocess_one_hadith(hadith_text, i, book, stats)
+        except Exception as e:
+            print(f"[ERROR] Hadith {i}: {e}")
+            return i, build_error_item(hadith_text, i, str(e))
+        n_chains = len(item["chains"])
+        types = [c["type"] for c in item["chains"]]
+        print(f"Done {i} | Chains: {n_chains} | Types: {types}")
+        return i, item
+
+    todo = (
+        (i, hadith_text)
+        for i, hadith_text in enumerate(hadiths, 1)
+        if i >= start_index
+    )
+    in_flight = set()
+    finished: Dict[int, Dict[str, Any]] = {}
+    next_index = start_index
+    unsaved: List[Dict[str, Any]] = []
+    try:
+        while True:
+            # Top up to CONCURRENCY tasks, started in hadith order
+            for i, hadith_text in islice(todo, CONCURRENCY - len(in_flight)):
+                in_flight.add(asyncio.create_task(run_one(i, hadith_text)))
+            if not in_flight:
+                break
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                i, item = task.result()
+                finished[i] = item
+            while next_index in finished:
+                item = finished.pop(next_index)
+                results.append(item)
+                unsaved.append(item)
+                next_index += 1
+            if len(unsaved) >= CHECKPOINT_EVERY:
+                append_results(OUT_JSON_PATH, unsaved)
+                unsaved.clear()
+    finally:
+        if unsaved:
+            append_results(OUT_JSON_PATH, unsaved)
+
+
+def build_result_item(
+    hadith_text: str,
+    hadith_index: int,
+    model_used: str,
+    route_reason: str,
+    extraction: HadithExtraction,
+) -> Dict[str, Any]:
     return {
         "hadith_index": hadith_index,
         "hadith_text": hadith_text,
@@ -721,37 +885,235 @@ def process_one_hadith(
     }
 
 
+def build_error_item(
+    hadith_text: str, hadith_index: int, error: str
+) -> Dict[str, Any]:
+    return {
+        "hadith_index": hadith_index,
+        "hadith_text": hadith_text,
+        "model_used": "",
+        "route_reason": "",
+        "chains": [],
+        "error": error,
+    }
+
+
+# =========================
+# Batch API
+# =========================
+EXTRACTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "HadithExtraction",
+        "schema": HadithExtraction.model_json_schema(),
+    },
+}
+
+
+def submit_batch(
+    client: OpenAI,
+    texts: Dict[int, str],
+    indices: List[int],
+    book: str,
+    model: str,
+    tag: str,
+) -> str:
+    """Write one extraction request per hadith to JSONL and start a batch.
+
+    A batch can only target one model, so each model gets its own.
+    Returns the batch id.
+    """
+    system_prompt = get_prompt(EXTRACTOR_PROMPTS, book)
+    path = f"{os.path.splitext(OUT_JSON_PATH)[0]}_batch_{tag}.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in indices:
+            request = {
+                "custom_id": f"hadith_{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "temperature": TEMP,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": EXTRACTOR_USER_PREFIX + texts[i]},
+                    ],
+                    "response_format": EXTRACTION_RESPONSE_FORMAT,
+                },
+            }
+            f.write(json_utils.dumps(request) + "\n")
+
+    with open(path, "rb") as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} ({tag}, {model}): {len(indices)} hadith(s)")
+    return batch.id
+
+
+def wait_for_batch(client: OpenAI, batch_id: str) -> Dict[str, str]:
+    """Poll a batch until it finishes; map custom_id -> message content.
+
+    Requests that failed are missing from the returned dict.
+    """
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.batches.retrieve(batch_id)
+    print(f"Batch {batch_id}: {batch.status}")
+
+    outputs: Dict[str, str] = {}
+    if not batch.output_file_id:
+        return outputs
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        record = json_utils.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            message = response["body"]["choices"][0]["message"]
+            outputs[record["custom_id"]] = message.get("content") or ""
+    return outputs
+
+
+def run_batch_pipeline(
+    hadiths: Iterable[str],
+    start_index: int,
+    book: str,
+    stats: RunStats,
+) -> List[Dict[str, Any]]:
+    """
+    Batch-mode counterpart of the process_one_hadith loop.
+
+    Long hadiths go to the strong model and the rest to the light model;
+    light results that fail validation are re-sent to the strong model in a
+    second, smaller batch. The router call is skipped in this mode.
+    """
+    client = OpenAI(api_key=OPENAI_API_KEY)
+    originals = {
+        i: hadith_text
+        for i, hadith_text in enumerate(hadiths, 1)
+        if i >= start_index
+    }
+    texts = {i: normalize_whitespace(text) for i, text in originals.items()}
+    if not texts:
+        return []
+    long_ids = [i for i, text in texts.items() if len(text) >= LEN_STRONG_THRESHOLD]
+    short_ids = [i for i, text in texts.items() if len(text) < LEN_STRONG_THRESHOLD]
+    stats.total += len(texts)
+    stats.len_threshold_true += len(long_ids)
+    stats.routed_to_strong += len(long_ids)
+
+    items: Dict[int, Dict[str, Any]] = {}
+    errors: Dict[int, str] = {}
+
+    def collect(batch_id: str, indices: List[int], model: str, route_reason: str) -> List[int]:
+        """Parse a finished batch into items; return the indices that failed."""
+        outputs = wait_for_batch(client, batch_id)
+        failed = []
+        for i in indices:
+            try:
+                content = outputs.get(f"hadith_{i}")
+                if content is None:
+                    raise ValueError("No batch output")
+                extraction = finish_extraction(
+                    texts[i], HadithExtraction.model_validate_json(content)
+                )
+            except Exception as e:
+                errors[i] = str(e)
+                failed.append(i)
+                continue
+            items[i] = build_result_item(
+                originals[i], i, model, route_reason, extraction
+            )
+        return failed
+
+    strong_batch = (
+        submit_batch(client, texts, long_ids, book, STRONG_MODEL, "strong")
+        if long_ids else None
+    )
+    light_batch = (
+        submit_batch(client, texts, short_ids, book, LIGHT_MODEL, "light")
+        if short_ids else None
+    )
+
+    fallback_ids: List[int] = []
+    fallback_batch = None
+    if light_batch:
+        fallback_ids = collect(light_batch, short_ids, LIGHT_MODEL, "default_light")
+        stats.light_success += len(short_ids) - len(fallback_ids)
+        if fallback_ids:
+            stats.used_fallback += len(fallback_ids)
+            fallback_batch = submit_batch(
+                client, texts, fallback_ids, book, STRONG_MODEL, "fallback"
+            )
+    if strong_batch:
+        failed = collect(strong_batch, long_ids, STRONG_MODEL, "length_threshold")
+        stats.strong_success += len(long_ids) - len(failed)
+    if fallback_batch:
+        failed = collect(fallback_batch, fallback_ids, STRONG_MODEL, "fallback")
+        stats.strong_success += len(fallback_ids) - len(failed)
+
+    return [
+        items.get(i) or build_error_item(originals[i], i, errors[i])
+        for i in sorted(texts)
+    ]
+
+
 # =========================
 # CSV Loading / Resuming
 # =========================
-def load_hadiths_from_csv(
+def iter_hadiths_from_csv(
     csv_path: str, text_column: str = "hadith_text"
-) -> List[str]:
-    hadiths: List[str] = []
-    with open(csv_path, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            return []
-
-        if text_column not in reader.fieldnames:
-            raise ValueError(
-                f"Column '{text_column}' not found in {csv_path}. "
-                f"Available columns: {reader.fieldnames}"
-            )
+) -> Iterator[str]:
+    """
+    Yield the non-empty hadith texts of a CSV one row at a time.
 
-        for row in reader:
-            value = (row.get(text_column) or "").strip()
-            if value:
-                hadiths.append(value)
-    return hadiths
+    The header is checked before returning, so a missing column fails
+    up front rather than midway through a run.
+    """
+    f = open(csv_path, "r", encoding="utf-8", newline="")
+    reader = csv.DictReader(f)
+    if not reader.fieldnames:
+        f.close()
+        return iter(())
+
+    if text_column not in reader.fieldnames:
+        f.close()
+        raise ValueError(
+            f"Column '{text_column}' not found in {csv_path}. "
+            f"Available columns: {reader.fieldnames}"
+        )
+
+    def rows() -> Iterator[str]:
+        with f:
+            for row in reader:
+                value = (row.get(text_column) or "").strip()
+                if value:
+                    yield value
+
+    return rows()
 
 
 def load_existing_results(path: str) -> List[Dict[str, Any]]:
+    # An interrupted run leaves its checkpoint behind, which is newer than path
+    checkpoint = checkpoint_path(path)
+    if os.path.exists(checkpoint):
+        results = []
+        with open(checkpoint, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    results.append(json_utils.loads(line))
+                except ValueError:
+                    break  # torn last line from the interruption
+        return results
+
     if not os.path.exists(path):
         return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = json_utils.loads(f.read())
         if isinstance(data, list):
             return data
         return []
@@ -760,8 +1122,26 @@ def load_existing_results(path: str) -> List[Dict[str, Any]]:
 
 
 def save_results(path: str, results: List[Dict[str, Any]]) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    with open(path, "wb") as f:
+        f.write(json_utils.dumps_bytes(results, indent=True))
+
+
+# During a run, progress goes to an append-only JSONL checkpoint next to
+# OUT_JSON_PATH (one record per line) instead of rewriting the whole JSON
+# array per hadith; the array is written once at the end.
+def checkpoint_path(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}.partial.jsonl"
+
+
+def start_checkpoint(path: str, results: List[Dict[str, Any]]) -> None:
+    """Start the checkpoint with the results carried over from a resume."""
+    with open(checkpoint_path(path), "w", encoding="utf-8") as f:
+        f.writelines(json_utils.dumps(item) + "\n" for item in results)
+
+
+def append_results(path: str, items: List[Dict[str, Any]]) -> None:
+    with open(checkpoint_path(path), "a", encoding="utf-8") as f:
+        f.writelines(json_utils.dumps(item) + "\n" for item in items)
 
 
 def build_test_output_path(path: str) -> str:
@@ -788,25 +1168,17 @@ def main():
             print(f"Saved test output to: {output_path}")
             print(f"Chains: {len(item['chains'])}")
         except Exception as e:
-            error_item = {
-                "hadith_index": 1,
-                "hadith_text": TEST_HADITH,
-                "model_used": "",
-                "route_reason": "",
-                "chains": [],
-                "error": str(e),
-            }
+            error_item = build_error_item(TEST_HADITH, 1, str(e))
             save_results(output_path, [error_item])
             print(f"[ERROR] Single hadith test failed: {e}")
             print(f"Saved error output to: {output_path}")
         return
 
-    print("Loading hadiths...")
-    hadiths = load_hadiths_from_csv(CSV_PATH, CSV_TEXT_COLUMN)
+    print(f"Streaming hadiths from {CSV_PATH}...")
+    hadiths = iter_hadiths_from_csv(CSV_PATH, CSV_TEXT_COLUMN)
     if MAX_HADITHS > 0:
-        hadiths = hadiths[:MAX_HADITHS]
-        print(f"Using first {len(hadiths)} hadith(s) due to MAX_HADITHS={MAX_HADITHS}")
-    print(f"Loaded: {len(hadiths)}")
+        hadiths = islice(hadiths, MAX_HADITHS)
+        print(f"Using at most {MAX_HADITHS} hadith(s) due to MAX_HADITHS={MAX_HADITHS}")
 
     if RESUME:
         results = load_existing_results(OUT_JSON_PATH)
@@ -817,40 +1189,25 @@ def main():
         start_index = 1
         print("Resume disabled (RESUME=0): starting from hadith_index=1")
 
+    start_checkpoint(OUT_JSON_PATH, results)
     stats = RunStats()
 
-    for i, hadith_text in enumerate(hadiths, 1):
-        if i < start_index:
-            continue
-
-        print(f"\n--- Hadith {i} ---")
-        try:
-            item = process_one_hadith(hadith_text, i, BOOK, stats)
-            results.append(item)
-            save_results(OUT_JSON_PATH, results)
-
-            n_chains = len(item["chains"])
-            types = [c["type"] for c in item["chains"]]
-            print(f"Saved {i}/{len(hadiths)} | Chains: {n_chains} | Types: {types}")
+    if USE_BATCH_API:
+        print("Batch mode enabled (USE_BATCH_API=1).")
+        results.extend(run_batch_pipeline(hadiths, start_index, BOOK, stats))
+    else:
+        print(f"Processing with CONCURRENCY={CONCURRENCY}")
+        asyncio.run(aprocess_hadiths(hadiths, start_index, BOOK, stats, results))
 
-        except Exception as e:
-            print(f"[ERROR] Hadith {i}: {e}")
-            results.append(
-                {
-                    "hadith_index": i,
-                    "hadith_text": hadith_text,
-                    "model_used": "",
-                    "route_reason": "",
-                    "chains": [],
-                    "error": str(e),
-                }
-            )
-            save_results(OUT_JSON_PATH, results)
+    save_results(OUT_JSON_PATH, results)
+    os.remove(checkpoint_path(OUT_JSON_PATH))
 
     print("\n=== DONE ===")
     print(f"Total processed: {stats.total}")
     print(f"Len>=threshold routed to strong: {stats.len_threshold_true}")
     print(f"Router complex=true: {stats.router_true}")
+    print(f"Markers complex=true (router skipped): {stats.markers_true}")
+    print(f"Markers simple (router skipped): {stats.markers_false}")
     print(f"Total routed to strong: {stats.routed_to_strong}")
     print(f"Light success: {stats.light_success}")
     print(f"Strong success: {stats.strong_success}")
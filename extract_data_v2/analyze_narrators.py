@@ -1,8 +1,12 @@
-import json
 import csv
+import sys
 from collections import Counter
 import os
 
+# Add parent directory to path to import the shared JSON helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_utils
+
 # --- إعدادات ---
 INPUT_FILE = "Bukhari/Bukhari_Without_Tashkel_results_advanced_with_matn.json" 
 OUTPUT_CSV = "Bukhari/narrators_stats.csv"
@@ -13,27 +17,24 @@ def analyze_narrators():
         return
 
     print(f"📂 Loading data from {INPUT_FILE}...")
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = json_utils.load_file(INPUT_FILE)
 
-    # 1. تجميع كل الأسماء
-    all_names = []
-    
+    # 1. تجميع كل الأسماء مع حساب التكرارات مباشرة (بدون قائمة وسيطة)
     print("🔍 Extracting narrator names...")
+    name_counts = Counter()
     for hadith in data:
-        # تأكد أن الحديث تمت معالجته وليس فيه خطأ
-        if "chains" in hadith and isinstance(hadith["chains"], list):
-            for chain in hadith["chains"]:
-                for narrator in chain["narrators"]:
-                    # تنظيف بسيط: إزالة المسافات الزائدة
-                    raw_name = narrator["name"].strip()
-                    if raw_name:
-                        all_names.append(raw_name)
+        # الأحاديث التي فشلت معالجتها ليس فيها سلاسل
+        name_counts.update(
+            # تنظيف بسيط: توحيد المسافات (الزائدة والداخلية)
+            " ".join(narrator["name"].split())
+            for chain in hadith.get("chains") or ()
+            for narrator in chain.get("narrators") or ()
+            if (narrator.get("name") or "").strip()
+        )
 
     # 2. حساب التكرارات
-    name_counts = Counter(all_names)
     unique_count = len(name_counts)
-    total_mentions = len(all_names)
+    total_mentions = sum(name_counts.values())
 
     print(f"📊 Statistics:")
     print(f"   - Total Narrator Mentions: {total_mentions}")
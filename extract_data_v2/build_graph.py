@@ -14,7 +14,7 @@ Schema:
   (:Book {book_id, section_id, name})
   (:Chapter {section_id, book_id, name})
   (:Hadith {hadith_id, page_number, book_id, full_text, matn,
-            full_text_plain, matn_plain})
+            full_text_plain, matn_plain})   full_text* omitted with --no-full-text
   (:Narrator {narrator_id, name, kunya, nasab, tabaqa,
               rank_ibn_hajar, rank_dhahabi, death_date, birth_date,
               aqeeda, original_names, jarh_wa_tadil_json})
@@ -30,8 +30,11 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Generator, Iterable, Optional
 
 # Load .env from project root (two levels up from this file)
 try:
@@ -47,12 +50,36 @@ try:
 except ImportError:
     _NEO4J_AVAILABLE = False
 
-# Arabic diacritic (tashkeel) Unicode ranges to strip for plain-text search
+# Add parent directory to path to import the shared JSON helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_utils
+
+# Rows per UNWIND transaction. Each batch is one round-trip plus a commit, so
+# bigger is faster as long as the transaction state fits in the server heap.
+# Hadith rows carry the full text and get a smaller batch; chain
+# relationship rows are tiny and get a larger one.
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_HADITH_BATCH_SIZE = 2_000
+DEFAULT_CHAIN_BATCH_SIZE = 20_000
+# Batches written concurrently (one session each) within an ingest step
+DEFAULT_CONCURRENCY = 4
+
+# Hadith node properties; rows sent to Neo4j carry only these keys
+HADITH_PROPERTIES = (
+    "hadith_id", "page_number", "book_id",
+    "full_text", "matn", "full_text_plain", "matn_plain",
+)
+
+# Arabic diacritic (tashkeel) Unicode ranges to strip for plain-text search.
+# A compiled character class beats str.translate with a deletion table here:
+# translate does a dict lookup per (non-ASCII) code point, the regex scans in C.
 _TASHKEEL_RE = re.compile(
     r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06DC\u06DF-\u06E4\u06E7\u06E8\u06EA-\u06ED]"
 )
 
 
+# Identical matn strings recur across hadith variants (and empty matn is common)
+@lru_cache(maxsize=65536)
 def strip_tashkeel(text: str) -> str:
     """Remove Arabic diacritical marks (tashkeel) from text."""
     return _TASHKEEL_RE.sub("", text)
@@ -62,38 +89,45 @@ def strip_tashkeel(text: str) -> str:
 # Data loading helpers
 # ---------------------------------------------------------------------------
 
-def load_bio(path: str) -> dict:
-    """Load narrator biographies from shamela_narrators.jsonl.
+def iter_jsonl(path: str) -> Generator[dict, None, None]:
+    """Yield the records of a JSONL file, skipping blank and malformed lines.
 
-    Returns dict keyed by narrator_id (str) → bio fields dict.
+    Lines are read as bytes and passed to json_utils.loads unchanged (no
+    decode or strip per line); blank lines simply fail to parse.
     """
-    bio = {}
-    with open(path, encoding="utf-8") as f:
+    with open(path, "rb") as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
             try:
-                r = json.loads(line)
+                record = json_utils.loads(line)
             except json.JSONDecodeError:
                 continue
-            if r.get("status") != "success":
-                continue
-            nid = str(r["narrator_id"])
-            bio[nid] = {
-                "name": (r.get("name") or "").lstrip(": ").strip(),
-                "kunya": r.get("kunya") or None,
-                "nasab": r.get("nasab") or None,
-                "tabaqa": r.get("tabaqa") or None,
-                "rank_ibn_hajar": r.get("rank_ibn_hajar") or None,
-                "rank_dhahabi": r.get("rank_dhahabi") or None,
-                "death_date": r.get("death_date") or None,
-                "birth_date": r.get("birth_date") or None,
-                "aqeeda": r.get("aqeeda") or None,
-                "relations": r.get("relations") or None,
-                # Store jarh_wa_tadil as JSON string (not queryable via Cypher directly)
-                "jarh_wa_tadil_json": json.dumps(r.get("jarh_wa_tadil") or [], ensure_ascii=False),
-            }
+            yield record
+
+
+def load_bio(path: str) -> dict:
+    """Load narrator biographies from shamela_narrators.jsonl.
+
+    Returns dict keyed by narrator_id (str) → bio fields dict.
+    """
+    bio = {}
+    for r in iter_jsonl(path):
+        if r.get("status") != "success":
+            continue
+        nid = str(r["narrator_id"])
+        bio[nid] = {
+            "name": (r.get("name") or "").lstrip(": ").strip(),
+            "kunya": r.get("kunya") or None,
+            "nasab": r.get("nasab") or None,
+            "tabaqa": r.get("tabaqa") or None,
+            "rank_ibn_hajar": r.get("rank_ibn_hajar") or None,
+            "rank_dhahabi": r.get("rank_dhahabi") or None,
+            "death_date": r.get("death_date") or None,
+            "birth_date": r.get("birth_date") or None,
+            "aqeeda": r.get("aqeeda") or None,
+            "relations": r.get("relations") or None,
+            # Store jarh_wa_tadil as JSON string (not queryable via Cypher directly)
+            "jarh_wa_tadil_json": json.dumps(r.get("jarh_wa_tadil") or [], ensure_ascii=False),
+        }
     return bio
 
 
@@ -102,8 +136,7 @@ def load_name_variants(path: str) -> dict:
 
     Returns dict keyed by narrator_id (str) → list of name strings.
     """
-    with open(path, encoding="utf-8") as f:
-        raw = json.load(f)
+    raw = json_utils.load_file(path)
     return {str(k): v for k, v in raw.items()}
 
 
@@ -120,14 +153,14 @@ def extract_section_id(href: str) -> Optional[int]:
     return None
 
 
-def parse_hadith_pages(path: str) -> Generator[dict, None, None]:
+def parse_hadith_pages(path: str, full_text: bool = True) -> Generator[dict, None, None]:
     """Stream shamela_book_1681.jsonl, yielding one dict per successful hadith.
 
     Yields:
         hadith_id      str   "{book_id}_{page_number}"
         page_number    int
         book_id        int
-        full_text      str
+        full_text      str   (with full_text_plain; left out when full_text=False)
         matn           str
         book_name      str
         book_section_id int | None
@@ -135,59 +168,87 @@ def parse_hadith_pages(path: str) -> Generator[dict, None, None]:
         chapter_section_id int | None
         narrators      list[{id: str, name: str}]
     """
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                r = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if r.get("status") != "success":
-                continue
+    for r in iter_jsonl(path):
+        if r.get("status") != "success":
+            continue
 
-            book_id = int(r["book_id"])
-            page_number = int(r["page_number"])
-            breadcrumbs = r.get("breadcrumb_links", [])
-
-            # breadcrumb[0] is always "فهرس الكتاب" (index link) — skip
-            # breadcrumb[1] = Book level
-            # breadcrumb[2] = Chapter level (may be absent)
-            book_name = breadcrumbs[1]["text"] if len(breadcrumbs) > 1 else ""
-            book_section_id = extract_section_id(breadcrumbs[1].get("href", "")) if len(breadcrumbs) > 1 else None
-
-            chapter_name = None
-            chapter_section_id = None
-            if len(breadcrumbs) > 2:
-                chapter_name = breadcrumbs[2]["text"]
-                chapter_section_id = extract_section_id(breadcrumbs[2].get("href", ""))
-
-            for block in r.get("hadith_blocks", []):
-                full_text = block.get("full_text") or ""
-                matn = block.get("matn") or ""
-                yield {
-                    "hadith_id": f"{book_id}_{page_number}",
-                    "page_number": page_number,
-                    "book_id": book_id,
-                    "full_text": full_text,
-                    "matn": matn,
-                    "full_text_plain": strip_tashkeel(full_text),
-                    "matn_plain": strip_tashkeel(matn),
-                    "book_name": book_name,
-                    "book_section_id": book_section_id,
-                    "chapter_name": chapter_name,
-                    "chapter_section_id": chapter_section_id,
-                    "narrators": block.get("narrators") or [],
-                }
+        book_id = int(r["book_id"])
+        page_number = int(r["page_number"])
+        breadcrumbs = r.get("breadcrumb_links", [])
+
+        # breadcrumb[0] is always "فهرس الكتاب" (index link) — skip
+        # breadcrumb[1] = Book level
+        # breadcrumb[2] = Chapter level (may be absent)
+        book_name = breadcrumbs[1]["text"] if len(breadcrumbs) > 1 else ""
+        book_section_id = extract_section_id(breadcrumbs[1].get("href", "")) if len(breadcrumbs) > 1 else None
+
+        chapter_name = None
+        chapter_section_id = None
+        if len(breadcrumbs) > 2:
+            chapter_name = breadcrumbs[2]["text"]
+            chapter_section_id = extract_section_id(breadcrumbs[2].get("href", ""))
+
+        for block in r.get("hadith_blocks", []):
+            matn = block.get("matn") or ""
+            record = {
+                "hadith_id": f"{book_id}_{page_number}",
+                "page_number": page_number,
+                "book_id": book_id,
+                "matn": matn,
+                "matn_plain": strip_tashkeel(matn),
+                "book_name": book_name,
+                "book_section_id": book_section_id,
+                "chapter_name": chapter_name,
+                "chapter_section_id": chapter_section_id,
+                "narrators": block.get("narrators") or [],
+            }
+            if full_text:
+                text = block.get("full_text") or ""
+                record["full_text"] = text
+                record["full_text_plain"] = strip_tashkeel(text)
+            yield record
+
+
+def collect_records(path: str, full_text: bool = True) -> tuple[list[dict], dict, dict, set[str]]:
+    """Parse all hadith pages, deduplicating books, chapters and narrators on the way.
+
+    Returns:
+        records       list of parse_hadith_pages dicts, in file order
+        books         dict keyed by book section_id → Book row
+        chapters      dict keyed by chapter section_id → Chapter row
+        narrator_ids  set of narrator ids (str) appearing in any chain
+    """
+    records = []
+    books = {}
+    chapters = {}
+    narrator_ids: set[str] = set()
+    for r in parse_hadith_pages(path, full_text):
+        records.append(r)
+
+        sid = r["book_section_id"]
+        if sid is not None and sid not in books:
+            books[sid] = {"section_id": sid, "book_id": r["book_id"], "name": r["book_name"]}
+
+        sid = r["chapter_section_id"]
+        if sid is not None and sid not in chapters:
+            chapters[sid] = {
+                "section_id": sid,
+                "book_id": r["book_id"],
+                "book_section_id": r["book_section_id"],
+                "name": r["chapter_name"] or "",
+            }
+
+        narrator_ids.update(str(n["id"]) for n in r["narrators"])
+    return records, books, chapters, narrator_ids
 
 
 # ---------------------------------------------------------------------------
 # Neo4j helpers
 # ---------------------------------------------------------------------------
 
-def create_constraints(driver) -> None:
+def create_constraints(driver, full_text: bool = True) -> None:
     """Create uniqueness constraints and indexes."""
+    ft_fields = "h.matn_plain, h.full_text_plain" if full_text else "h.matn_plain"
     queries = [
         "CREATE CONSTRAINT book_section_id_unique IF NOT EXISTS FOR (b:Book) REQUIRE b.section_id IS UNIQUE",
         "CREATE CONSTRAINT chapter_section_id_unique IF NOT EXISTS FOR (c:Chapter) REQUIRE c.section_id IS UNIQUE",
@@ -198,7 +259,7 @@ def create_constraints(driver) -> None:
         "CREATE INDEX narrator_tabaqa_idx IF NOT EXISTS FOR (n:Narrator) ON (n.tabaqa)",
         "CREATE INDEX narrator_rank_ibn_hajar_idx IF NOT EXISTS FOR (n:Narrator) ON (n.rank_ibn_hajar)",
         # Full-text index for tashkeel-free search across hadith text
-        "CREATE FULLTEXT INDEX hadith_plain_text_ft IF NOT EXISTS FOR (h:Hadith) ON EACH [h.matn_plain, h.full_text_plain]",
+        f"CREATE FULLTEXT INDEX hadith_plain_text_ft IF NOT EXISTS FOR (h:Hadith) ON EACH [{ft_fields}]",
     ]
     with driver.session() as session:
         for q in queries:
@@ -206,103 +267,116 @@ def create_constraints(driver) -> None:
     print("  Constraints and indexes created.")
 
 
-def _run_batch(session, query: str, batch: list) -> int:
-    result = session.run(query, batch=batch)
-    summary = result.consume()
+def _write_batch(tx, query: str, batch: list) -> int:
+    summary = tx.run(query, batch=batch).consume()
     return summary.counters.nodes_created + summary.counters.relationships_created
 
 
-def ingest_books(driver, records: list[dict], batch_size: int = 200) -> int:
-    """MERGE Book nodes."""
-    # Deduplicate by section_id
-    seen = {}
-    for r in records:
-        sid = r["book_section_id"]
-        if sid is None:
-            continue
-        if sid not in seen:
-            seen[sid] = {"section_id": sid, "book_id": r["book_id"], "name": r["book_name"]}
+def _run_batches(driver, query: str, rows: Iterable[dict], batch_size: int, concurrency: int) -> int:
+    """Run an UNWIND query over rows, batch_size rows per transaction.
+
+    Rows are consumed lazily, so a generator is only materialized one batch
+    at a time. Up to `concurrency` batches are in flight at once, each in
+    its own session, so the client is not idle during every commit
+    round-trip. execute_write retries transient errors, such as deadlocks
+    between concurrent batches that touch the same narrator.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+    def run(batch: list) -> int:
+        with driver.session() as session:
+            return session.execute_write(_write_batch, query, batch)
+
+    rows = iter(rows)
+    batches = iter(lambda: list(islice(rows, batch_size)), [])
+    if concurrency <= 1:
+        return sum(map(run, batches))
+
+    total = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for batch in batches:
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(future.result() for future in done)
+            pending.add(pool.submit(run, batch))
+        total += sum(future.result() for future in pending)
+    return total
+
 
-    unique_books = list(seen.values())
+def ingest_books(
+    driver,
+    books: dict,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """MERGE Book nodes (books as deduplicated by collect_records)."""
+    unique_books = list(books.values())
     query = """
     UNWIND $batch AS row
     MERGE (b:Book {section_id: row.section_id})
     SET b.book_id = row.book_id, b.name = row.name
     """
-    total = 0
-    with driver.session() as session:
-        for i in range(0, len(unique_books), batch_size):
-            chunk = unique_books[i:i + batch_size]
-            total += _run_batch(session, query, chunk)
-    return total
-
+    return _run_batches(driver, query, unique_books, batch_size, concurrency)
 
-def ingest_chapters(driver, records: list[dict], batch_size: int = 200) -> int:
-    """MERGE Chapter nodes and IN_BOOK relationships."""
-    seen = {}
-    for r in records:
-        sid = r["chapter_section_id"]
-        if sid is None:
-            continue
-        if sid not in seen:
-            seen[sid] = {
-                "section_id": sid,
-                "book_id": r["book_id"],
-                "book_section_id": r["book_section_id"],
-                "name": r["chapter_name"] or "",
-            }
 
-    unique_chapters = list(seen.values())
-    query = """
+def ingest_chapters(
+    driver,
+    chapters: dict,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """MERGE Chapter nodes (chapters as deduplicated by collect_records), then IN_BOOK relationships."""
+    unique_chapters = list(chapters.values())
+    node_query = """
     UNWIND $batch AS row
     MERGE (c:Chapter {section_id: row.section_id})
     SET c.book_id = row.book_id, c.name = row.name
-    WITH c, row
+    """
+    # Separate pass once every chapter exists: two index lookups per row
+    in_book_query = """
+    UNWIND $batch AS row
+    MATCH (c:Chapter {section_id: row.section_id})
     MATCH (b:Book {section_id: row.book_section_id})
     MERGE (c)-[:IN_BOOK]->(b)
     """
-    total = 0
-    with driver.session() as session:
-        for i in range(0, len(unique_chapters), batch_size):
-            chunk = unique_chapters[i:i + batch_size]
-            total += _run_batch(session, query, chunk)
+    total = _run_batches(driver, node_query, unique_chapters, batch_size, concurrency)
+    total += _run_batches(driver, in_book_query, unique_chapters, batch_size, concurrency)
     return total
 
 
-def ingest_hadiths(driver, records: list[dict], batch_size: int = 200) -> int:
-    """MERGE Hadith nodes and IN_CHAPTER relationships."""
-    query_with_chapter = """
+def ingest_hadiths(
+    driver,
+    records: list[dict],
+    batch_size: int = DEFAULT_HADITH_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """MERGE Hadith nodes, then IN_CHAPTER relationships."""
+    node_query = """
     UNWIND $batch AS row
     MERGE (h:Hadith {hadith_id: row.hadith_id})
-    SET h.page_number = row.page_number,
-        h.book_id = row.book_id,
-        h.full_text = row.full_text,
-        h.matn = row.matn,
-        h.full_text_plain = row.full_text_plain,
-        h.matn_plain = row.matn_plain
-    WITH h, row
-    MATCH (c:Chapter {section_id: row.chapter_section_id})
-    MERGE (h)-[:IN_CHAPTER]->(c)
+    SET h += row
     """
-    query_no_chapter = """
+    in_chapter_query = """
     UNWIND $batch AS row
-    MERGE (h:Hadith {hadith_id: row.hadith_id})
-    SET h.page_number = row.page_number,
-        h.book_id = row.book_id,
-        h.full_text = row.full_text,
-        h.matn = row.matn,
-        h.full_text_plain = row.full_text_plain,
-        h.matn_plain = row.matn_plain
+    MATCH (h:Hadith {hadith_id: row.hadith_id})
+    MATCH (c:Chapter {section_id: row.chapter_section_id})
+    MERGE (h)-[:IN_CHAPTER]->(c)
     """
-    with_ch = [r for r in records if r["chapter_section_id"] is not None]
-    without_ch = [r for r in records if r["chapter_section_id"] is None]
+    # Blocks of one page share a hadith_id; keep the last one, as sequential
+    # SETs would, so concurrent batches never race on the same node
+    unique_hadiths = list({r["hadith_id"]: r for r in records}.values())
+    # Only node properties go over the wire (not narrators, book/chapter names, ...)
+    rows = [{k: r[k] for k in HADITH_PROPERTIES if k in r} for r in unique_hadiths]
+    in_chapter = [
+        {"hadith_id": r["hadith_id"], "chapter_section_id": r["chapter_section_id"]}
+        for r in unique_hadiths
+        if r["chapter_section_id"] is not None
+    ]
 
-    total = 0
-    with driver.session() as session:
-        for i in range(0, len(with_ch), batch_size):
-            total += _run_batch(session, query_with_chapter, with_ch[i:i + batch_size])
-        for i in range(0, len(without_ch), batch_size):
-            total += _run_batch(session, query_no_chapter, without_ch[i:i + batch_size])
+    total = _run_batches(driver, node_query, rows, batch_size, concurrency)
+    total += _run_batches(driver, in_chapter_query, in_chapter, batch_size, concurrency)
     return total
 
 
@@ -311,14 +385,15 @@ def ingest_narrators(
     narrator_ids: set[str],
     bio: dict,
     name_variants: dict,
-    batch_size: int = 200,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> int:
     """MERGE Narrator nodes with biographical properties and name variants."""
     narrator_list = []
     for nid in narrator_ids:
         b = bio.get(nid, {})
         variants = name_variants.get(nid, [])
-        narrator_list.append({
+        row = {
             "narrator_id": int(nid),
             "name": b.get("name") or variants[0] if variants else f"narrator_{nid}",
             "kunya": b.get("kunya"),
@@ -332,53 +407,50 @@ def ingest_narrators(
             "relations": b.get("relations"),
             "jarh_wa_tadil_json": b.get("jarh_wa_tadil_json") or "[]",
             "original_names": variants,
-        })
+        }
+        # Most bio fields are empty; unset ones are not sent or written at all
+        narrator_list.append({k: v for k, v in row.items() if v is not None})
 
     query = """
     UNWIND $batch AS row
     MERGE (n:Narrator {narrator_id: row.narrator_id})
-    SET n.name = row.name,
-        n.kunya = row.kunya,
-        n.nasab = row.nasab,
-        n.tabaqa = row.tabaqa,
-        n.rank_ibn_hajar = row.rank_ibn_hajar,
-        n.rank_dhahabi = row.rank_dhahabi,
-        n.death_date = row.death_date,
-        n.birth_date = row.birth_date,
-        n.aqeeda = row.aqeeda,
-        n.relations = row.relations,
-        n.jarh_wa_tadil_json = row.jarh_wa_tadil_json,
-        n.original_names = row.original_names
+    SET n += row
     """
-    total = 0
-    with driver.session() as session:
-        for i in range(0, len(narrator_list), batch_size):
-            total += _run_batch(session, query, narrator_list[i:i + batch_size])
-    return total
+    return _run_batches(driver, query, narrator_list, batch_size, concurrency)
 
 
-def ingest_chains(driver, records: list[dict], batch_size: int = 200) -> int:
-    """Create NARRATED and TRANSMITTED_HADITH relationships."""
-    narrated_rels = []
-    transmitted_rels = []
-
-    for r in records:
-        narrators = r["narrators"]
-        hadith_id = r["hadith_id"]
-        n = len(narrators)
-        for i in range(n - 1):
-            narrated_rels.append({
-                "from_id": int(narrators[i]["id"]),
-                "to_id": int(narrators[i + 1]["id"]),
-                "position": i,
-                "hadith_id": hadith_id,
-            })
-        if n > 0:
-            transmitted_rels.append({
-                "narrator_id": int(narrators[-1]["id"]),
-                "hadith_id": hadith_id,
-                "position": n - 1,
-            })
+def ingest_chains(
+    driver,
+    records: list[dict],
+    batch_size: int = DEFAULT_CHAIN_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """Create NARRATED and TRANSMITTED_HADITH relationships.
+
+    Relationship rows are generated per batch rather than built up front,
+    which keeps this (the largest) step's memory flat.
+    """
+    def narrated_rels():
+        for r in records:
+            narrators = r["narrators"]
+            hadith_id = r["hadith_id"]
+            for i in range(len(narrators) - 1):
+                yield {
+                    "from_id": int(narrators[i]["id"]),
+                    "to_id": int(narrators[i + 1]["id"]),
+                    "position": i,
+                    "hadith_id": hadith_id,
+                }
+
+    def transmitted_rels():
+        for r in records:
+            narrators = r["narrators"]
+            if narrators:
+                yield {
+                    "narrator_id": int(narrators[-1]["id"]),
+                    "hadith_id": r["hadith_id"],
+                    "position": len(narrators) - 1,
+                }
 
     narrated_query = """
     UNWIND $batch AS row
@@ -392,15 +464,24 @@ def ingest_chains(driver, records: list[dict], batch_size: int = 200) -> int:
     MATCH (h:Hadith {hadith_id: row.hadith_id})
     CREATE (n)-[:TRANSMITTED_HADITH {position: row.position}]->(h)
     """
-    total = 0
-    with driver.session() as session:
-        for i in range(0, len(narrated_rels), batch_size):
-            total += _run_batch(session, narrated_query, narrated_rels[i:i + batch_size])
-        for i in range(0, len(transmitted_rels), batch_size):
-            total += _run_batch(session, transmitted_query, transmitted_rels[i:i + batch_size])
+    total = _run_batches(driver, narrated_query, narrated_rels(), batch_size, concurrency)
+    total += _run_batches(driver, transmitted_query, transmitted_rels(), batch_size, concurrency)
     return total
 
 
+VERIFY_LABELS = ("Book", "Chapter", "Hadith", "Narrator")
+VERIFY_REL_TYPES = ("IN_BOOK", "IN_CHAPTER", "NARRATED", "TRANSMITTED_HADITH")
+
+# All verification counts in one round-trip. Each subquery always yields one
+# row (0 for an empty label/type) and its single-label / single-type
+# count(*) is answered from the counts store rather than by a scan.
+VERIFY_COUNTS_QUERY = "\n".join(
+    [f"CALL {{ MATCH (:{label}) RETURN count(*) AS {label} }}" for label in VERIFY_LABELS]
+    + [f"CALL {{ MATCH ()-[:{rel}]->() RETURN count(*) AS {rel} }}" for rel in VERIFY_REL_TYPES]
+    + ["RETURN *"]
+)
+
+
 # ---------------------------------------------------------------------------
 # Schema description for chatbot
 # ---------------------------------------------------------------------------
@@ -511,9 +592,12 @@ RETURN path LIMIT 5
 """
 
 
-def write_schema_description(path: str) -> None:
+def write_schema_description(path: str, full_text: bool = True) -> None:
+    text = SCHEMA_DESCRIPTION
+    if not full_text:
+        text = "".join(line for line in text.splitlines(keepends=True) if not line.startswith("- `full_text`"))
     with open(path, "w", encoding="utf-8") as f:
-        f.write(SCHEMA_DESCRIPTION)
+        f.write(text)
     print(f"  Schema description written to {path}")
 
 
@@ -521,6 +605,14 @@ def write_schema_description(path: str) -> None:
 # Main
 # ---------------------------------------------------------------------------
 
+def _batch_size_arg(value: str) -> int:
+    """argparse type for the batch size flags: an integer of at least 1."""
+    size = int(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {size}")
+    return size
+
+
 def main():
     parser = argparse.ArgumentParser(description="Ingest Shamela Bukhari data into Neo4j")
     parser.add_argument("--hadith", default="extract_data_v2/firecrawl/shamela_book_1681.jsonl",
@@ -532,7 +624,19 @@ def main():
     parser.add_argument("--neo4j-uri", default=os.environ.get("NEO4J_URI", "bolt://localhost:7687"))
     parser.add_argument("--neo4j-user", default=os.environ.get("NEO4J_USER", "neo4j"))
     parser.add_argument("--neo4j-password", default=os.environ.get("NEO4J_PASSWORD", ""))
-    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--batch-size", type=_batch_size_arg, default=DEFAULT_BATCH_SIZE,
+                        help="Rows per transaction for Book, Chapter and Narrator nodes. Larger batches "
+                             "mean fewer round-trips/commits but more server heap per transaction; "
+                             "lower it if Neo4j runs out of memory")
+    parser.add_argument("--hadith-batch", type=_batch_size_arg, default=DEFAULT_HADITH_BATCH_SIZE,
+                        help="Rows per transaction for Hadith nodes (large text payloads)")
+    parser.add_argument("--chain-batch", type=_batch_size_arg, default=DEFAULT_CHAIN_BATCH_SIZE,
+                        help="Rows per transaction for NARRATED/TRANSMITTED_HADITH relationships")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Batches written in parallel within each ingest step (1 = sequential)")
+    parser.add_argument("--no-full-text", dest="full_text", action="store_false",
+                        help="Do not store full_text/full_text_plain on Hadith nodes (a much smaller Hadith "
+                             "store; the sanad wording then only lives in the source JSONL)")
     parser.add_argument("--dry-run", action="store_true", help="Print stats without writing to Neo4j")
     parser.add_argument("--schema-out", default="extract_data_v2/schema_description.md",
                         help="Path to write schema description for chatbot")
@@ -547,26 +651,16 @@ def main():
     name_variants = load_name_variants(args.name_variants)
     print(f"  {len(name_variants)} narrator name variant sets loaded.")
 
-    # --- Stream hadith pages ---
+    # --- Stream hadith pages (books, chapters and narrator IDs deduplicated in the same pass) ---
     print("Parsing hadith pages...")
-    records = list(parse_hadith_pages(args.hadith))
+    records, books, chapters, narrator_ids = collect_records(args.hadith, args.full_text)
     print(f"  {len(records)} hadith records parsed.")
-
-    # Collect all unique narrator IDs
-    narrator_ids: set[str] = set()
-    for r in records:
-        for n in r["narrators"]:
-            narrator_ids.add(str(n["id"]))
     print(f"  {len(narrator_ids)} unique narrator IDs found in chains.")
-
-    # Stats
-    books = {r["book_section_id"] for r in records if r["book_section_id"]}
-    chapters = {r["chapter_section_id"] for r in records if r["chapter_section_id"]}
     print(f"  {len(books)} unique books, {len(chapters)} unique chapters.")
 
     if args.dry_run:
         print("\nDry run complete. No data written to Neo4j.")
-        write_schema_description(args.schema_out)
+        write_schema_description(args.schema_out, args.full_text)
         return
 
     # --- Ingest ---
@@ -580,41 +674,40 @@ def main():
     )
     try:
         print("\nCreating constraints and indexes...")
-        create_constraints(driver)
+        create_constraints(driver, args.full_text)
 
         print("Ingesting Book nodes...")
-        n = ingest_books(driver, records, args.batch_size)
+        n = ingest_books(driver, books, args.batch_size, args.concurrency)
         print(f"  Done ({n} created/merged).")
 
         print("Ingesting Chapter nodes + IN_BOOK...")
-        n = ingest_chapters(driver, records, args.batch_size)
+        n = ingest_chapters(driver, chapters, args.batch_size, args.concurrency)
         print(f"  Done ({n} created/merged).")
 
         print("Ingesting Hadith nodes + IN_CHAPTER...")
-        n = ingest_hadiths(driver, records, args.batch_size)
+        n = ingest_hadiths(driver, records, args.hadith_batch, args.concurrency)
         print(f"  Done ({n} created/merged).")
 
         print("Ingesting Narrator nodes...")
-        n = ingest_narrators(driver, narrator_ids, bio, name_variants, args.batch_size)
+        n = ingest_narrators(driver, narrator_ids, bio, name_variants, args.batch_size, args.concurrency)
         print(f"  Done ({n} created/merged).")
 
         print("Ingesting chain relationships (NARRATED + TRANSMITTED_HADITH)...")
-        n = ingest_chains(driver, records, args.batch_size)
+        n = ingest_chains(driver, records, args.chain_batch, args.concurrency)
         print(f"  Done ({n} relationships created).")
 
         print("\nVerification counts:")
         with driver.session() as session:
-            for label in ("Book", "Chapter", "Hadith", "Narrator"):
-                count = session.run(f"MATCH (n:{label}) RETURN count(n) AS c").single()["c"]
-                print(f"  {label}: {count}")
-            for rel in ("IN_BOOK", "IN_CHAPTER", "NARRATED", "TRANSMITTED_HADITH"):
-                count = session.run(f"MATCH ()-[r:{rel}]->() RETURN count(r) AS c").single()["c"]
-                print(f"  [{rel}]: {count}")
+            counts = session.run(VERIFY_COUNTS_QUERY).single()
+        for label in VERIFY_LABELS:
+            print(f"  {label}: {counts[label]}")
+        for rel in VERIFY_REL_TYPES:
+            print(f"  [{rel}]: {counts[rel]}")
 
     finally:
         driver.close()
 
-    write_schema_description(args.schema_out)
+    write_schema_description(args.schema_out, args.full_text)
     print("\nDone.")
 
 
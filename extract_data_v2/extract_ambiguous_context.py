@@ -1,8 +1,12 @@
-import json
 import csv
+import sys
 from collections import defaultdict, Counter
 import os
 
+# Add parent directory to path to import the shared JSON helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_utils
+
 # --- إعدادات ---
 INPUT_JSON = "Bukhari/Bukhari_Without_Tashkel_results_advanced_with_matn.json"
 OUTPUT_CSV = "Bukhari/ambiguous_narrators_for_llm.csv"
@@ -33,9 +37,9 @@ def extract_contexts():
         print("❌ File not found.")
         return
 
-    print(f"📂 Loading data from {INPUT_JSON}...")
-    with open(INPUT_JSON, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Hadiths are streamed one at a time (ijson); only context_map is kept
+    print(f"📂 Streaming data from {INPUT_JSON}...")
+    data = json_utils.iter_items(INPUT_JSON)
 
     # Dictionary format:
     # { "Ambiguous Name": Counter({ "Student Name 1": count, "Student Name 2": count }) }
@@ -5,8 +5,11 @@ Import Neo4j hadith graph from JSON export.
 Usage:
     python import_database.py hadith_graph_export.json
     python import_database.py hadith_graph_export.json --clear
+    python import_database.py hadith_graph_export.json.gz
 """
 
+import gzip
+import io
 import os
 import sys
 import json
@@ -21,6 +24,23 @@ except ImportError:
     print("Please install: pip install neo4j python-dotenv")
     sys.exit(1)
 
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, only needed for .zst input
+    zstandard = None
+
+
+def open_input(filepath: str):
+    """Open an export file as text, decompressing .gz / .zst by suffix."""
+    if filepath.endswith(".gz"):
+        return gzip.open(filepath, 'rt', encoding='utf-8')
+    if filepath.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading .zst exports requires: pip install zstandard")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(filepath, 'rb'))
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(filepath, 'r', encoding='utf-8')
+
 
 class DatabaseImporter:
     """Import Neo4j database from JSON export."""
@@ -71,7 +91,7 @@ class DatabaseImporter:
         """Import database from JSON file."""
         print(f"Loading {filepath}...")
         
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open_input(filepath) as f:
             data = json.load(f)
         
         print(f"Schema version: {data['metadata'].get('schema_version', 'unknown')}")
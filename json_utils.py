@@ -0,0 +1,114 @@
+"""
+JSON serialization helpers for the export scripts.
+
+This module uses orjson when it is installed and falls back to the
+standard library json module otherwise. Both paths produce UTF-8 text
+without ASCII escaping, so Arabic text is written as-is.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Iterator, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document from bytes or str.
+
+    Args:
+        data: Raw JSON document
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: str) -> Any:
+    """
+    Parse a JSON file, memory-mapping it when orjson is available.
+
+    orjson parses the mapped bytes directly, so no intermediate copy of the
+    file or decoded text is made.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Parsed Python object
+    """
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def iter_items(path: str) -> Iterator[Any]:
+    """
+    Yield the elements of a file holding a top-level JSON array.
+
+    With ijson installed the array is stream-parsed, so only the current
+    element is held in memory. Otherwise the file is loaded with load_file.
+
+    Args:
+        path: Path to the JSON file
+
+    Yields:
+        Each array element
+    """
+    if ijson is None:
+        yield from load_file(path)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a compact JSON string (non-ASCII kept as-is).
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: JSON-serializable object
+        indent: Pretty-print with 2-space indentation
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -9,9 +9,9 @@ import os
 import time
 import logging
 from typing import Optional, Dict, List, Any
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, AsyncGraphDatabase
 from neo4j.exceptions import ServiceUnavailable, AuthError, TransientError
 
 try:
@@ -51,6 +51,7 @@ class Neo4jClient:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.driver = None
+        self.async_driver = None
 
     def connect(self) -> None:
         """Establish connection to Neo4j with retry logic."""
@@ -90,6 +91,27 @@ class Neo4jClient:
             self.driver = None
             logger.info("Neo4j connection closed")
 
+    async def connect_async(self) -> None:
+        """Establish the async driver connection (used by the FastAPI backend)."""
+        try:
+            self.async_driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password)
+            )
+            await self.async_driver.verify_connectivity()
+            logger.info(f"Connected async driver to Neo4j at {self.uri}")
+        except AuthError as e:
+            raise Exception(
+                f"Authentication failed. Check username and password. Error: {e}"
+            )
+
+    async def close_async(self) -> None:
+        """Close the async Neo4j connection."""
+        if self.async_driver:
+            await self.async_driver.close()
+            self.async_driver = None
+            logger.info("Neo4j async connection closed")
+
     def __enter__(self):
         """Context manager entry."""
         self.connect()
@@ -111,6 +133,18 @@ class Neo4jClient:
         finally:
             session.close()
 
+    @asynccontextmanager
+    async def async_session(self):
+        """Get an async Neo4j session as an async context manager."""
+        if not self.async_driver:
+            raise Exception("Not connected to Neo4j. Call connect_async() first.")
+
+        session = self.async_driver.session()
+        try:
+            yield session
+        finally:
+            await session.close()
+
     def clear_database(self) -> None:
         """
         Clear all nodes and relationships from the database.
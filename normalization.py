@@ -5,7 +5,6 @@ This module provides functions to normalize Arabic text for consistent
 matching and deduplication of narrator names in the knowledge graph.
 """
 
-import re
 from typing import Optional
 
 
@@ -36,11 +35,9 @@ def normalize_ar(name: Optional[str]) -> str:
     if not name:
         return ""
 
-    # Strip leading/trailing whitespace
-    result = name.strip()
-
-    # Collapse multiple whitespace characters to single space
-    result = re.sub(r'\s+', ' ', result)
+    # Strip leading/trailing whitespace and collapse runs to a single space
+    # (str.split() splits on exactly the characters regex \s matches)
+    result = " ".join(name.split())
 
     # Remove tatweel (kashida) - Unicode U+0640
     result = result.replace('\u0640', '')
@@ -9,6 +9,7 @@ This module provides functions for:
 """
 
 import os
+import sys
 import json
 import logging
 from typing import Dict, List, Any, Tuple, Optional
@@ -18,6 +19,19 @@ from normalization import normalize_ar
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only default for narrators without attributes
+_EMPTY: Dict[str, Any] = {}
+
+
+def _intern_norm(name: str) -> str:
+    """
+    Normalize a narrator name and intern the result.
+
+    The same norms repeat across many edge and position rows; interning
+    keeps one string object per narrator in the accumulated lists.
+    """
+    return sys.intern(normalize_ar(name))
+
 
 def detect_format(data: List[Dict[str, Any]]) -> str:
     """
@@ -124,7 +138,7 @@ def extract_chains_from_result(hadith: Dict[str, Any]) -> List[List[str]]:
     # Find positions of "lead" narrators
     lead_indices = [
         i for i, narrator in enumerate(narrators)
-        if narrator.get("attributes", {}).get("role") == "lead"
+        if (narrator.get("attributes") or _EMPTY).get("role") == "lead"
     ]
 
     if not lead_indices:
@@ -150,6 +164,24 @@ def extract_chains_from_result(hadith: Dict[str, Any]) -> List[List[str]]:
     return chains
 
 
+def extract_chains_from_results(hadiths: List[Dict[str, Any]]) -> List[List[List[str]]]:
+    """
+    Extract narrator chains from a batch of hadiths in result format.
+
+    Batch entry point for extract_chains_from_result, so callers can hand
+    over chunks of records and the per-hadith routine can be swapped for a
+    compiled implementation without touching them.
+
+    Args:
+        hadiths: List of hadith dicts in result format
+
+    Returns:
+        One list of chains per hadith, in input order
+    """
+    extract = extract_chains_from_result
+    return [extract(hadith) for hadith in hadiths]
+
+
 def build_ingestion_data(
     data: List[Dict[str, Any]],
     source: str,
@@ -235,7 +267,7 @@ def build_ingestion_data(
                 # Add narrators
                 for name in chain:
                     if name:
-                        norm = normalize_ar(name)
+                        norm = _intern_norm(name)
                         if norm not in narrators_dict:
                             narrators_dict[norm] = name
 
@@ -247,8 +279,8 @@ def build_ingestion_data(
                     if from_name and to_name:
                         edges.append({
                             "source": source,
-                            "from_norm": normalize_ar(from_name),
-                            "to_norm": normalize_ar(to_name),
+                            "from_norm": _intern_norm(from_name),
+                            "to_norm": _intern_norm(to_name),
                             "hadith_index": hadith_index,
                             "chain_id": chain_id,
                             "pos": i + 1
@@ -260,7 +292,7 @@ def build_ingestion_data(
                         "source": source,
                         "hadith_index": hadith_index,
                         "chain_id": chain_id,
-                        "start_norm": normalize_ar(chain[0])
+                        "start_norm": _intern_norm(chain[0])
                     })
 
         except Exception as e:
@@ -389,7 +421,7 @@ def build_chains_data(
                         "hadith_index": hadith_index,
                         "chain_id": chain_id,
                         "pos": pos,
-                        "narrator_norm": normalize_ar(name)
+                        "narrator_norm": _intern_norm(name)
                     })
 
     logger.info(
@@ -471,6 +503,7 @@ if __name__ == "__main__":
     }
     chains = extract_chains_from_result(test_hadith)
     assert chains == [["C", "B", "A"]]
+    assert extract_chains_from_results([test_hadith, {}]) == [[["C", "B", "A"]], []]
     print("✓ Chain extraction working")
 
     print("\nAll tests passed!")